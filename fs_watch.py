@@ -0,0 +1,257 @@
+"""
+Filesystem Watch Module for Video Converter Daemon
+
+Provides InotifyWatcher, a small ctypes wrapper around Linux inotify used to
+pick up new files between full directory scans. Used when daemon.watch is
+enabled in local mode.
+
+Notes:
+- inotify watches are per directory, so every subdirectory gets a watch;
+  directories created or moved in later are watched as they appear
+- Files already inside such a directory when its watch is added are not
+  reported (a writer may still have them open); they produce events once
+  closed, or are left to the next full scan
+- Files are reported on IN_CLOSE_WRITE / IN_MOVED_TO, i.e. once the writer
+  has closed them or they were renamed into place
+- Symlinked directories are not followed, matching discovery
+- No third-party dependencies; raises WatchError where inotify is unavailable
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger('VideoConverter.watch')
+
+# inotify event bits (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+
+# Events requested for every watched directory
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MOVE_SELF
+              | IN_ONLYDIR | IN_DONT_FOLLOW)
+# struct inotify_event header: wd, mask, cookie, len (name follows)
+_EVENT_HEADER = struct.Struct('iIII')
+# Bytes read from the inotify fd per read() call
+READ_BUFFER_BYTES = 64 * 1024
+
+
+class WatchError(Exception):
+    """Raised when inotify is unavailable or the watch limit is reached."""
+    pass
+
+
+def _load_libc():
+    """Load libc with inotify support, or raise WatchError."""
+    name = ctypes.util.find_library('c') or 'libc.so.6'
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError) as e:
+        raise WatchError(f"inotify is not available: {e}")
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+class InotifyWatcher:
+    """Watch directory trees for new files.
+
+    Call start() once, then read() in a loop; read() returns the paths of
+    files that finished writing or were moved in since the last call. If
+    the kernel queue overflows or a watched directory is moved, overflowed
+    is set: events may have been lost and watch paths may be stale, so the
+    caller should rescan and replace the watcher.
+    """
+
+    def __init__(self, roots: List[str]):
+        """Initialize watcher (does not add any watches).
+
+        Args:
+            roots: Absolute directory paths to watch recursively.
+        """
+        self._roots = list(roots)
+        self._libc = None
+        self._fd = -1
+        self._wake_r = -1
+        self._wake_w = -1
+        self._poller = None  # select.poll object, created by start()
+        self._watches: Dict[int, str] = {}
+        self.overflowed = False
+
+    def start(self):
+        """Create the inotify instance and watch every directory under the roots.
+
+        Raises:
+            WatchError: If inotify is unavailable or the per-user watch
+                limit (fs.inotify.max_user_watches) is reached.
+        """
+        self._libc = _load_libc()
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise WatchError(f"inotify_init1 failed: {os.strerror(err)}")
+        self._fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        # poll rather than select: select rejects fds >= FD_SETSIZE (1024)
+        self._poller = select.poll()
+        self._poller.register(self._fd, select.POLLIN)
+        self._poller.register(self._wake_r, select.POLLIN)
+
+        try:
+            for root in self._roots:
+                self._add_tree(root)
+        except WatchError:
+            self.close()
+            raise
+        logger.info("Watching %d directories for new files", len(self._watches))
+
+    @property
+    def watch_count(self) -> int:
+        """Number of directories currently watched."""
+        return len(self._watches)
+
+    def _add_watch(self, path: str) -> bool:
+        """Add a watch on one directory.
+
+        Returns:
+            False if the directory vanished or cannot be read.
+
+        Raises:
+            WatchError: On the watch limit or any other inotify failure.
+        """
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                logger.debug("Cannot watch %s: %s", path, os.strerror(err))
+                return False
+            if err == errno.ENOSPC:
+                raise WatchError(
+                    f"inotify watch limit reached at {path} "
+                    f"(raise fs.inotify.max_user_watches)"
+                )
+            raise WatchError(f"inotify_add_watch failed for {path}: {os.strerror(err)}")
+        self._watches[wd] = path
+        return True
+
+    def _add_tree(self, root: str):
+        """Watch root and every directory below it.
+
+        Each directory is watched before it is listed, so subdirectories
+        created in between are reported by one or the other. Files seen
+        while listing are not reported.
+        """
+        stack = [root]
+        while stack:
+            dirpath = stack.pop()
+            if not self._add_watch(dirpath):
+                continue
+            try:
+                with os.scandir(dirpath) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError as e:
+                logger.debug("Cannot list %s: %s", dirpath, e)
+
+    def read(self, timeout: Optional[float]) -> Set[str]:
+        """Wait for events and return the paths of new files.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            Paths of new files; empty on timeout or when woken by wake().
+        """
+        paths: Set[str] = set()
+        poller = self._poller
+        if poller is None or self._fd < 0:
+            return paths
+        ready = {fd for fd, _ in poller.poll(None if timeout is None else timeout * 1000)}
+        if self._fd < 0:
+            # Closed by another thread while waiting
+            return paths
+
+        if self._wake_r in ready:
+            try:
+                while os.read(self._wake_r, 64):
+                    pass
+            except BlockingIOError:
+                pass
+
+        if self._fd in ready:
+            while True:
+                try:
+                    data = os.read(self._fd, READ_BUFFER_BYTES)
+                except BlockingIOError:
+                    break
+                if not data:
+                    break
+                self._parse_events(data, paths)
+        return paths
+
+    def _parse_events(self, data: bytes, paths: Set[str]):
+        """Decode a buffer of inotify events into new file paths."""
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & (IN_Q_OVERFLOW | IN_MOVE_SELF):
+                self.overflowed = True
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            dirpath = self._watches.get(wd)
+            if dirpath is None or not name:
+                continue
+
+            path = os.path.join(dirpath, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        self._add_tree(path)
+                    except WatchError as e:
+                        logger.warning("%s", e)
+                        self.overflowed = True
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                paths.add(path)
+
+    def wake(self):
+        """Make a blocked read() return now. Safe to call from a signal handler."""
+        if self._wake_w < 0:
+            return
+        try:
+            os.write(self._wake_w, b'\0')
+        except OSError:
+            pass
+
+    def close(self):
+        """Release the inotify instance and all watches."""
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            if fd >= 0:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._fd = self._wake_r = self._wake_w = -1
+        self._poller = None
+        self._watches.clear()
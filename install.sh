@@ -354,6 +354,13 @@ if [ -f "$SOURCE_DIR/sftp_ops.py" ]; then
     echo "[OK] SFTP operations module installed to /usr/local/bin/sftp_ops.py"
 fi
 
+# Copy filesystem watch module (needed for daemon.watch)
+if [ -f "$SOURCE_DIR/fs_watch.py" ]; then
+    cp "$SOURCE_DIR/fs_watch.py" /usr/local/bin/fs_watch.py
+    chmod 644 /usr/local/bin/fs_watch.py
+    echo "[OK] Filesystem watch module installed to /usr/local/bin/fs_watch.py"
+fi
+
 # Install paramiko if remote mode is configured
 if python3 -c "
 import yaml, sys
@@ -43,6 +43,11 @@ show_stats() {
     if [ -f "$STATE_DIR/processed.json" ]; then
         PROCESSED_COUNT=$(jq '. | length' "$STATE_DIR/processed.json" 2>/dev/null || echo "0")
     fi
+    # Conversions not yet compacted into processed.json
+    if [ -f "$STATE_DIR/processed.jsonl" ]; then
+        JOURNAL_COUNT=$(wc -l < "$STATE_DIR/processed.jsonl")
+        PROCESSED_COUNT=$((PROCESSED_COUNT + JOURNAL_COUNT))
+    fi
 
     # Get service status
     if $SYSTEMCTL_CMD is-active --quiet "$SERVICE_NAME" 2>/dev/null; then
@@ -96,6 +101,7 @@ from collections import defaultdict
 format_type = "$format"
 config_file = "/etc/video-converter/config.yaml"
 processed_file = "/var/lib/video-converter/processed.json"
+journal_file = "/var/lib/video-converter/processed.jsonl"
 
 try:
     with open(config_file) as f:
@@ -115,6 +121,16 @@ if os.path.exists(processed_file):
             processed = set(json.load(f))
     except:
         pass
+if os.path.exists(journal_file):
+    with open(journal_file) as f:
+        for line in f:
+            try:
+                processed.add(json.loads(line)['hash'])
+            except (ValueError, KeyError, TypeError):
+                pass
+# 32-hex BLAKE2b keys from older versions are the full form of the
+# 16-hex fingerprint now recorded
+processed = {h[:16] if isinstance(h, str) and len(h) == 32 else h for h in processed}
 
 # Scan directories
 extensions = set(config['processing']['include_extensions'])
@@ -149,9 +165,12 @@ for directory in directories:
                 if should_exclude:
                     continue
 
-                # Check if already processed
-                file_hash = hashlib.sha256(str(video_file).encode()).hexdigest()
-                if file_hash not in processed:
+                # Check if already processed (current BLAKE2b fingerprint or
+                # a SHA-256 key written by older versions)
+                path_bytes = str(video_file).encode()
+                file_hash = hashlib.blake2b(path_bytes, digest_size=16).hexdigest()[:16]
+                legacy_hash = hashlib.sha256(path_bytes).hexdigest()
+                if file_hash not in processed and legacy_hash not in processed:
                     # Check if output exists
                     output_path = video_file.with_suffix('.m4v')
                     if not output_path.exists() or output_path == video_file:
@@ -256,10 +275,12 @@ case "${1:-}" in
         read -p "Are you sure? (yes/no): " CONFIRM
         if [ "$CONFIRM" = "yes" ]; then
             STATE_DIR="/var/lib/video-converter"
-            sudo rm -f "$STATE_DIR/processed.json"
+            # Stop first: the daemon writes processed.json on shutdown
+            $SYSTEMCTL_CMD stop "$SERVICE_NAME"
+            sudo rm -f "$STATE_DIR/processed.json" "$STATE_DIR/processed.jsonl"
             echo "Database reset complete"
-            echo "Restarting service..."
-            $SYSTEMCTL_CMD restart "$SERVICE_NAME"
+            echo "Starting service..."
+            $SYSTEMCTL_CMD start "$SERVICE_NAME"
         else
             echo "Cancelled"
         fi
@@ -316,7 +337,7 @@ exists = []
 for file_hash in processed:
     # We can't recover the original path from the hash, so we can only verify
     # that the processed.json file isn't corrupted
-    if not isinstance(file_hash, str) or len(file_hash) != 64:
+    if not isinstance(file_hash, str) or len(file_hash) not in (16, 32, 64):
         missing.append(file_hash)
 
 if missing:
@@ -192,7 +192,7 @@ class TestRunner:
         daemon = VideoConverterDaemon(str(config_file))
 
         # Add hash and save
-        test_hash = 'a' * 64
+        test_hash = 0xaaaaaaaaaaaaaaaa
         daemon.processed_files.add(test_hash)
         daemon.save_processed_files()
 
@@ -222,7 +222,7 @@ class TestRunner:
         config_file, state_dir, _ = self.create_temp_config()
         daemon = VideoConverterDaemon(str(config_file))
 
-        test_hash = 'a' * 64
+        test_hash = 0xaaaaaaaaaaaaaaaa
         daemon.processed_files.add(test_hash)
         daemon.conversion_times[test_hash] = {
             "timestamp": 1234567890,
@@ -235,9 +235,9 @@ class TestRunner:
         with open(db_file, 'r') as f:
             data = json.load(f)
 
-        self.assert_in(test_hash, data)
-        self.assert_equal(data[test_hash]['duration_seconds'], 42)
-        self.assert_equal(data[test_hash]['timestamp'], 1234567890)
+        self.assert_in('a' * 16, data)
+        self.assert_equal(data['a' * 16]['duration_seconds'], 42)
+        self.assert_equal(data['a' * 16]['timestamp'], 1234567890)
 
     def test_load_old_format_processed_files(self):
         """Test backward compatibility with old format"""
@@ -249,19 +249,19 @@ class TestRunner:
         with open(db_file, 'w') as f:
             json.dump(old_format, f)
 
-        # Should load successfully
+        # Should load successfully; SHA-256 keys are held for lazy migration
         daemon = VideoConverterDaemon(str(config_file))
-        self.assert_equal(len(daemon.processed_files), 2)
-        self.assert_in('a' * 64, daemon.processed_files)
+        self.assert_equal(len(daemon._legacy_processed), 2)
+        self.assert_in(b'\xaa' * 32, daemon._legacy_processed)
 
-    def test_file_hash_is_sha256(self):
-        """Test that file hash is SHA-256"""
+    def test_file_hash_is_blake2b(self):
+        """Test that file hash is a 64-bit BLAKE2b fingerprint"""
         config_file, _, _ = self.create_temp_config()
         daemon = VideoConverterDaemon(str(config_file))
 
         hash_value = daemon.get_file_hash("/some/file.mp4")
-        self.assert_equal(len(hash_value), 64)
-        self.assert_true(all(c in '0123456789abcdef' for c in hash_value))
+        self.assert_true(isinstance(hash_value, int))
+        self.assert_true(0 <= hash_value < 2 ** 64)
 
     def test_file_hash_deterministic(self):
         """Test that same file produces same hash"""
@@ -411,7 +411,7 @@ class TestRunner:
 
         # File hash tests
         print("File Hash Tests:")
-        self.run_test(self.test_file_hash_is_sha256, "File hash is SHA-256")
+        self.run_test(self.test_file_hash_is_blake2b, "File hash is BLAKE2b")
         self.run_test(self.test_file_hash_deterministic, "File hash deterministic")
         self.run_test(self.test_file_hash_different_paths, "Different paths produce different hashes")
         print()
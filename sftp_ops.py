@@ -12,16 +12,33 @@ Security notes:
 - Thread-safe via threading.Lock
 """
 
+import contextlib
+import fnmatch
+import inspect
 import logging
 import posixpath
+import queue
+import re
 import threading
 import time
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
 
 import paramiko
 
 logger = logging.getLogger('VideoConverter.sftp')
 
+# Bytes per SFTP read/write request (paramiko's SFTPFile.MAX_REQUEST_SIZE)
+SFTP_REQUEST_SIZE = 32768
+# Default read requests kept outstanding per download; the channel window
+# is sized to match so the server can keep that much data in flight
+SFTP_MAX_REQUESTS_DEFAULT = 256
+# SFTPClient.get() gained max_concurrent_prefetch_requests in paramiko 3.3;
+# older versions prefetch every block of the file at once
+_GET_ACCEPTS_REQUEST_LIMIT = (
+    'max_concurrent_prefetch_requests'
+    in inspect.signature(paramiko.SFTPClient.get).parameters
+)
+
 
 class SFTPConnectionError(Exception):
     """Raised when SFTP connection fails."""
@@ -75,6 +92,12 @@ class SFTPConnection:
         port: SSH port (default 22).
         key_file: Path to SSH private key file (optional, uses agent if not set).
         connect_timeout: SSH connection timeout in seconds.
+        max_requests: Read requests kept in flight per download; also sets
+            the SFTP channel window to max_requests * SFTP_REQUEST_SIZE.
+        channel_timeout: Seconds an SFTP request may wait for the server
+            before failing (None waits indefinitely). Set on every
+            (re)connect rather than per call, so threads sharing the
+            connection never change each other's timeout.
         logger: Logger instance.
     """
 
@@ -85,6 +108,8 @@ class SFTPConnection:
         port: int = 22,
         key_file: Optional[str] = None,
         connect_timeout: int = 30,
+        max_requests: int = SFTP_MAX_REQUESTS_DEFAULT,
+        channel_timeout: Optional[float] = None,
         custom_logger: Optional[logging.Logger] = None,
     ):
         self.host = host
@@ -92,6 +117,8 @@ class SFTPConnection:
         self.port = port
         self.key_file = key_file
         self.connect_timeout = connect_timeout
+        self.max_requests = max_requests
+        self.channel_timeout = channel_timeout
         self.logger = custom_logger or logger
 
         self._ssh: Optional[paramiko.SSHClient] = None
@@ -121,13 +148,24 @@ class SFTPConnection:
                 'timeout': self.connect_timeout,
                 'allow_agent': True,
                 'look_for_keys': True,
+                # Video payloads are already entropy-coded; zlib on the
+                # transport would only burn CPU on both ends and cap
+                # throughput at single-threaded compressor speed
+                'compress': False,
             }
 
             if self.key_file:
                 connect_kwargs['key_filename'] = self.key_file
 
             self._ssh.connect(**connect_kwargs)
-            self._sftp = self._ssh.open_sftp()
+            # paramiko's default 2 MB window allows only 64 reads in flight,
+            # capping a download at 2 MB per round trip on high-latency links
+            self._sftp = paramiko.SFTPClient.from_transport(
+                self._ssh.get_transport(),
+                window_size=self.max_requests * SFTP_REQUEST_SIZE,
+            )
+            if self.channel_timeout:
+                self._sftp.get_channel().settimeout(float(self.channel_timeout))
             self.logger.info("Connected to %s@%s:%d", self.user, self.host, self.port)
         except Exception as e:
             self._cleanup_locked()
@@ -194,11 +232,57 @@ class SFTPConnection:
         return False
 
 
+class SFTPConnectionPool:
+    """Fixed-size pool of SFTPConnections for concurrent transfers.
+
+    Each SSH session is one TCP stream with its own flow-control window,
+    so transfers running on separate connections do not share a window
+    or queue behind each other's requests. Connections are opened lazily
+    on first checkout and reused afterwards; the SFTP helpers reconnect a
+    connection that has dropped.
+
+    Args:
+        size: Maximum number of connections.
+        **conn_kwargs: Passed to SFTPConnection for each connection.
+    """
+
+    def __init__(self, size: int, **conn_kwargs):
+        self.size = size
+        self._conn_kwargs = conn_kwargs
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._all: List[SFTPConnection] = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def acquire(self) -> Iterator[SFTPConnection]:
+        """Check out a connection, waiting while all are in use."""
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = SFTPConnection(**self._conn_kwargs)
+                with self._lock:
+                    self._all.append(conn)
+            try:
+                yield conn
+            finally:
+                self._idle.put(conn)
+
+    def close(self):
+        """Disconnect every connection the pool has opened."""
+        with self._lock:
+            conns = list(self._all)
+        for conn in conns:
+            conn.disconnect()
+
+
 def sftp_list_videos(
     conn: SFTPConnection,
     remote_dirs: List[str],
     extensions: List[str],
     exclude_patterns: Optional[List[str]] = None,
+    stats: Optional[Dict[str, Tuple[int, float]]] = None,
 ) -> List[str]:
     """Recursively list video files on the remote host.
 
@@ -207,14 +291,15 @@ def sftp_list_videos(
         remote_dirs: List of remote directories to scan.
         extensions: List of video file extensions to match (without dot).
         exclude_patterns: List of filename patterns to exclude.
+        stats: If given, filled with the (size_bytes, mtime_epoch) of each
+            returned path, taken from the directory listing so callers
+            need no sftp_stat() round trip per file.
 
     Returns:
         List of remote file paths.
     """
-    import fnmatch
-
     conn.ensure_connected()
-    exclude_patterns = exclude_patterns or []
+    exclude_re = compile_fnmatch_patterns(exclude_patterns or [])
     ext_set = {ext.lower() for ext in extensions}
     results = []
 
@@ -238,17 +323,14 @@ def sftp_list_videos(
                 # Check extension
                 _, ext = posixpath.splitext(entry.filename)
                 if ext and ext[1:].lower() in ext_set:
-                    # Check exclude patterns
-                    should_exclude = False
-                    for pattern in exclude_patterns:
-                        if fnmatch.fnmatch(entry.filename, pattern):
-                            should_exclude = True
-                            break
-                        if fnmatch.fnmatch(remote_path, pattern):
-                            should_exclude = True
-                            break
-                    if not should_exclude:
-                        results.append(remote_path)
+                    # Check exclude patterns against the name and the full path
+                    if exclude_re is not None and (
+                            exclude_re.match(entry.filename)
+                            or exclude_re.match(remote_path)):
+                        continue
+                    results.append(remote_path)
+                    if stats is not None:
+                        stats[remote_path] = _attr_size_mtime(entry)
 
     for remote_dir in remote_dirs:
         conn.logger.debug("Scanning remote directory: %s", remote_dir)
@@ -257,6 +339,20 @@ def sftp_list_videos(
     return results
 
 
+def compile_fnmatch_patterns(patterns: List[str]) -> Optional[Pattern]:
+    """Combine fnmatch patterns into one compiled regex.
+
+    regex.match(name) is true when fnmatch.fnmatch(name, p) is true for any
+    pattern p, without re-translating the patterns for every file.
+
+    Returns:
+        Compiled regex, or None if there are no patterns.
+    """
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns))
+
+
 def _is_dir(attr: paramiko.SFTPAttributes) -> bool:
     """Check if an SFTP entry is a directory."""
     import stat
@@ -269,6 +365,13 @@ def _is_regular(attr: paramiko.SFTPAttributes) -> bool:
     return stat.S_ISREG(attr.st_mode) if attr.st_mode is not None else False
 
 
+def _attr_size_mtime(attr: paramiko.SFTPAttributes) -> Tuple[int, float]:
+    """Return (size_bytes, mtime_epoch) from SFTP attributes."""
+    size = attr.st_size if attr.st_size is not None else 0
+    mtime = attr.st_mtime if attr.st_mtime is not None else 0.0
+    return (size, mtime)
+
+
 def sftp_stat(conn: SFTPConnection, path: str) -> Tuple[int, float]:
     """Get remote file size and modification time.
 
@@ -284,10 +387,7 @@ def sftp_stat(conn: SFTPConnection, path: str) -> Tuple[int, float]:
     """
     conn.ensure_connected()
     try:
-        attr = conn.sftp.stat(path)
-        size = attr.st_size if attr.st_size is not None else 0
-        mtime = attr.st_mtime if attr.st_mtime is not None else 0.0
-        return (size, mtime)
+        return _attr_size_mtime(conn.sftp.stat(path))
     except IOError as e:
         raise SFTPOperationError(f"Failed to stat {path}: {e}") from e
 
@@ -296,51 +396,48 @@ def sftp_download(
     conn: SFTPConnection,
     remote_path: str,
     local_path: str,
-    timeout: Optional[int] = None,
 ) -> None:
     """Download a file from the remote host.
 
+    A stalled transfer fails after the connection's channel_timeout.
+
     Args:
         conn: Active SFTPConnection.
         remote_path: Remote file path.
         local_path: Local destination path.
-        timeout: Transfer timeout in seconds (applied via channel timeout).
 
     Raises:
         SFTPOperationError: If download fails.
     """
     conn.ensure_connected()
     try:
-        if timeout:
-            conn.sftp.get_channel().settimeout(float(timeout))
-        conn.sftp.get(remote_path, local_path)
+        if _GET_ACCEPTS_REQUEST_LIMIT:
+            conn.sftp.get(
+                remote_path, local_path,
+                max_concurrent_prefetch_requests=conn.max_requests,
+            )
+        else:
+            conn.sftp.get(remote_path, local_path)
     except IOError as e:
         raise SFTPOperationError(f"Failed to download {remote_path}: {e}") from e
     except OSError as e:
         raise SFTPOperationError(f"Local write error downloading {remote_path}: {e}") from e
-    finally:
-        if timeout:
-            try:
-                conn.sftp.get_channel().settimeout(None)
-            except Exception:
-                pass
 
 
 def sftp_upload(
     conn: SFTPConnection,
     local_path: str,
     remote_path: str,
-    timeout: Optional[int] = None,
 ) -> None:
     """Upload a file to the remote host using atomic temp-then-rename.
 
     Uploads to <remote_path>.tmp first, then renames to prevent partial files.
+    A stalled transfer fails after the connection's channel_timeout.
 
     Args:
         conn: Active SFTPConnection.
         local_path: Local source file path.
         remote_path: Remote destination path.
-        timeout: Transfer timeout in seconds.
 
     Raises:
         SFTPOperationError: If upload fails.
@@ -348,8 +445,6 @@ def sftp_upload(
     conn.ensure_connected()
     tmp_remote = remote_path + '.tmp'
     try:
-        if timeout:
-            conn.sftp.get_channel().settimeout(float(timeout))
         conn.sftp.put(local_path, tmp_remote)
         conn.sftp.rename(tmp_remote, remote_path)
     except IOError as e:
@@ -365,12 +460,6 @@ def sftp_upload(
         except Exception:
             pass
         raise SFTPOperationError(f"Local read error uploading to {remote_path}: {e}") from e
-    finally:
-        if timeout:
-            try:
-                conn.sftp.get_channel().settimeout(None)
-            except Exception:
-                pass
 
 
 def sftp_delete(conn: SFTPConnection, path: str) -> None:
@@ -390,6 +479,36 @@ def sftp_delete(conn: SFTPConnection, path: str) -> None:
         raise SFTPOperationError(f"Failed to delete {path}: {e}") from e
 
 
+def sftp_delete_many(conn: SFTPConnection, paths: List[str]) -> List[str]:
+    """Delete several files on the remote host over one connection check.
+
+    Each sftp_delete() call pays a liveness round trip before the remove;
+    batching pays it once for the whole list. A failure on one path does
+    not stop the remaining deletes. A path that no longer exists counts
+    as deleted.
+
+    Args:
+        conn: Active SFTPConnection.
+        paths: Remote file paths to delete.
+
+    Returns:
+        List of paths that could not be deleted.
+    """
+    if not paths:
+        return []
+    conn.ensure_connected()
+    failed = []
+    for path in paths:
+        try:
+            conn.sftp.remove(path)
+        except FileNotFoundError:
+            pass
+        except IOError as e:
+            conn.logger.error("Failed to delete %s: %s", path, e)
+            failed.append(path)
+    return failed
+
+
 def sftp_utime(conn: SFTPConnection, path: str, times: Tuple[float, float]) -> None:
     """Set access and modification times on a remote file.
 
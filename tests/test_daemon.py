@@ -5,6 +5,7 @@ import tempfile
 import json
 import sys
 import os
+import errno
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -15,6 +16,7 @@ from video_converter_daemon import (
     VideoConverterDaemon,
     ConfigValidationError,
     parse_arguments,
+    compile_exclude_patterns,
     DEFAULT_CONFIG_PATH,
 )
 
@@ -117,6 +119,74 @@ class TestConfigValidation:
             finally:
                 os.unlink(f.name)
 
+    def test_invalid_hwaccel(self, minimal_config):
+        """Test that unknown hwaccel backend is rejected"""
+        minimal_config['conversion']['hwaccel'] = 'opencl'
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            import yaml
+            yaml.dump(minimal_config, f)
+            f.flush()
+            try:
+                with pytest.raises(ConfigValidationError, match="Invalid hwaccel"):
+                    VideoConverterDaemon(f.name)
+            finally:
+                os.unlink(f.name)
+
+    def test_hwaccel_codec_mismatch(self, minimal_config):
+        """Test that cuda is rejected for codecs without an NVENC encoder"""
+        minimal_config['conversion']['hwaccel'] = 'cuda'
+        minimal_config['conversion']['codec'] = 'libvpx-vp9'
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            import yaml
+            yaml.dump(minimal_config, f)
+            f.flush()
+            try:
+                with pytest.raises(ConfigValidationError, match="cannot be used with hwaccel"):
+                    VideoConverterDaemon(f.name)
+            finally:
+                os.unlink(f.name)
+
+    def test_invalid_remux_when_possible(self, minimal_config):
+        """Test that remux_when_possible must be a boolean"""
+        minimal_config['conversion']['remux_when_possible'] = 'yes'
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            import yaml
+            yaml.dump(minimal_config, f)
+            f.flush()
+            try:
+                with pytest.raises(ConfigValidationError, match="Invalid remux_when_possible"):
+                    VideoConverterDaemon(f.name)
+            finally:
+                os.unlink(f.name)
+
+    def test_hwaccel_auto_requires_software_codec(self, minimal_config):
+        """Test that hwaccel auto rejects a codec tied to one backend"""
+        minimal_config['conversion']['hwaccel'] = 'auto'
+        minimal_config['conversion']['codec'] = 'h264_nvenc'
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            import yaml
+            yaml.dump(minimal_config, f)
+            f.flush()
+            try:
+                with pytest.raises(ConfigValidationError, match="hwaccel 'auto'"):
+                    VideoConverterDaemon(f.name)
+            finally:
+                os.unlink(f.name)
+
+    def test_invalid_vaapi_device(self, minimal_config):
+        """Test that vaapi_device must be a DRM render node"""
+        minimal_config['conversion']['hwaccel'] = 'vaapi'
+        minimal_config['conversion']['vaapi_device'] = '/dev/sda'
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            import yaml
+            yaml.dump(minimal_config, f)
+            f.flush()
+            try:
+                with pytest.raises(ConfigValidationError, match="Invalid vaapi_device"):
+                    VideoConverterDaemon(f.name)
+            finally:
+                os.unlink(f.name)
+
     def test_invalid_audio_bitrate(self, minimal_config):
         """Test that invalid audio bitrate is rejected"""
         minimal_config['conversion']['audio_bitrate'] = 'invalid'
@@ -130,6 +200,14 @@ class TestConfigValidation:
             finally:
                 os.unlink(f.name)
 
+    def test_config_rejects_python_tags(self, tmp_path):
+        """Test that config loading stays safe with the C YAML loader"""
+        import yaml
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("directories: !!python/object/apply:os.getcwd []\n")
+        with pytest.raises(yaml.constructor.ConstructorError):
+            VideoConverterDaemon(str(config_file), validate_only=True)
+
 
 class TestProcessedFiles:
     """Test processed files save/load"""
@@ -183,7 +261,7 @@ class TestProcessedFiles:
         daemon = VideoConverterDaemon(str(config_file))
 
         # Add some hashes and save
-        test_hash = 'a' * 64  # SHA-256 hash
+        test_hash = 0xaaaaaaaaaaaaaaaa  # 64-bit path fingerprint
         daemon.processed_files.add(test_hash)
         daemon.save_processed_files()
 
@@ -195,6 +273,50 @@ class TestProcessedFiles:
         daemon2 = VideoConverterDaemon(str(config_file))
         assert test_hash in daemon2.processed_files
 
+    def test_saved_snapshot_is_valid_json(self, temp_config):
+        """Test the streamed processed.json parses for zero and several entries"""
+        config_file, state_dir = temp_config
+        daemon = VideoConverterDaemon(str(config_file))
+
+        daemon.save_processed_files()
+        with open(state_dir / 'processed.json') as f:
+            assert json.load(f) == {}
+
+        daemon.processed_files.update({1, 2})
+        daemon.conversion_times[1] = {"timestamp": 10, "duration_seconds": 3}
+        daemon._legacy_processed.add(b'\xcc' * 32)
+        daemon.save_processed_files()
+        with open(state_dir / 'processed.json') as f:
+            data = json.load(f)
+        assert set(data) == {'0000000000000001', '0000000000000002', 'c' * 64}
+        assert data['0000000000000001'] == {"timestamp": 10, "duration_seconds": 3}
+
+    def test_snapshot_synced_before_replace(self, temp_config):
+        """Test processed.json data reaches disk before it replaces the old file"""
+        config_file, state_dir = temp_config
+        daemon = VideoConverterDaemon(str(config_file))
+        daemon.processed_files.add(1)
+        calls = []
+
+        with patch('video_converter_daemon._fdatasync',
+                   side_effect=lambda fd: calls.append('sync')):
+            with patch('os.replace', side_effect=lambda *a: calls.append('replace')):
+                daemon.save_processed_files()
+
+        assert calls == ['sync', 'replace']
+
+    def test_load_blake2b_keys_as_fingerprints(self, temp_config):
+        """Test 32-hex BLAKE2b keys load as the fingerprint of the same path"""
+        import hashlib
+        config_file, state_dir = temp_config
+        path = "/videos/movie.mkv"
+        old_key = hashlib.blake2b(path.encode(), digest_size=16).hexdigest()
+        with open(state_dir / 'processed.json', 'w') as f:
+            json.dump({old_key: {'timestamp': 1000}}, f)
+
+        daemon = VideoConverterDaemon(str(config_file))
+        assert daemon.processed_files == {daemon.get_file_hash(path)}
+
     def test_load_invalid_processed_files(self, temp_config):
         """Test that invalid processed files are handled gracefully"""
         config_file, state_dir = temp_config
@@ -208,6 +330,74 @@ class TestProcessedFiles:
         # Should reset to empty set on invalid data
         assert len(daemon.processed_files) == 0
 
+    def test_load_rejects_non_hex_keys(self, temp_config):
+        """Test keys of a valid length but not lowercase hex are rejected"""
+        config_file, state_dir = temp_config
+        for bad_key in ('A' * 16, 'g' * 32, '0x' + 'a' * 14):
+            with open(state_dir / 'processed.json', 'w') as f:
+                json.dump({'a' * 16: {'timestamp': 1}, bad_key: {'timestamp': 1}}, f)
+
+            daemon = VideoConverterDaemon(str(config_file))
+            assert len(daemon.processed_files) == 0
+
+    def test_record_processed_appends_journal(self, temp_config):
+        """Test completed conversions are appended and replayed on restart"""
+        config_file, state_dir = temp_config
+        daemon = VideoConverterDaemon(str(config_file))
+
+        daemon._record_processed(0xbb, {"timestamp": 1000, "duration_seconds": 5})
+
+        journal = state_dir / 'processed.jsonl'
+        assert journal.read_text() == '{"hash":"00000000000000bb","timestamp":1000,"duration_seconds":5}\n'
+        assert not (state_dir / 'processed.json').exists()
+
+        daemon2 = VideoConverterDaemon(str(config_file))
+        assert 0xbb in daemon2.processed_files
+        assert daemon2.conversion_times[0xbb]['duration_seconds'] == 5
+
+    def test_journal_skips_torn_line(self, temp_config):
+        """Test a truncated trailing journal line does not discard other entries"""
+        config_file, state_dir = temp_config
+        journal = state_dir / 'processed.jsonl'
+        journal.write_text(
+            json.dumps({"hash": 'c' * 32, "timestamp": 1}) + '\n' + '{"hash": "dd'
+        )
+
+        daemon = VideoConverterDaemon(str(config_file))
+        assert daemon.processed_files == {0xcccccccccccccccc}
+
+    def test_journal_compaction(self, temp_config):
+        """Test the journal is folded into processed.json and removed"""
+        config_file, state_dir = temp_config
+        daemon = VideoConverterDaemon(str(config_file))
+
+        with patch('video_converter_daemon.JOURNAL_COMPACT_EVERY', 2):
+            daemon._record_processed(0xee, {"timestamp": 1})
+            assert (state_dir / 'processed.jsonl').exists()
+            daemon._record_processed(0xff, {"timestamp": 2})
+
+        assert not (state_dir / 'processed.jsonl').exists()
+        with open(state_dir / 'processed.json') as f:
+            assert set(json.load(f)) == {'00000000000000ee', '00000000000000ff'}
+
+
+    def test_startup_removes_stale_temp_files(self, temp_config):
+        """Test temp files left in work_dir by a crash are removed on startup"""
+        config_file, state_dir = temp_config
+        work_dir = state_dir.parent / "work"
+        stale = [work_dir / ('a' * 16 + '_output.m4v'), work_dir / ('b' * 16 + '_input.MKV'),
+                 work_dir / ('c' * 64 + '_output.m4v')]
+        other = work_dir / 'notes.txt'
+        for path in stale + [other]:
+            path.write_bytes(b"data")
+
+        VideoConverterDaemon(str(config_file), dry_run=True)
+        assert all(path.exists() for path in stale)
+
+        VideoConverterDaemon(str(config_file))
+        assert not any(path.exists() for path in stale)
+        assert other.exists()
+
 
 class TestPathSecurity:
     """Test path security functions"""
@@ -273,6 +463,17 @@ class TestPathSecurity:
         is_safe = daemon_instance._is_safe_path(disallowed_file, [str(tmp_path / "allowed")])
         assert is_safe is False
 
+    def test_safe_path_rejects_sibling_prefix(self, daemon_instance, tmp_path):
+        """Test a directory sharing the allowed dir's name prefix is rejected"""
+        (tmp_path / "allowed").mkdir()
+        sibling = tmp_path / "allowed2"
+        sibling.mkdir()
+        test_file = sibling / "video.mp4"
+        test_file.touch()
+
+        is_safe = daemon_instance._is_safe_path(test_file, [str(tmp_path / "allowed")])
+        assert is_safe is False
+
 
 class TestFileHash:
     """Test file hash generation"""
@@ -320,14 +521,15 @@ class TestFileHash:
 
         return VideoConverterDaemon(str(config_file))
 
-    def test_file_hash_is_sha256(self, daemon_instance):
-        """Test that file hash is SHA-256 (64 hex chars)"""
+    def test_file_hash_is_blake2b(self, daemon_instance):
+        """Test that file hash is the leading 64 bits of a 128-bit BLAKE2b digest"""
+        import hashlib
         file_path = "/some/video/file.mp4"
         hash_value = daemon_instance.get_file_hash(file_path)
 
-        # SHA-256 produces 64 hex characters
-        assert len(hash_value) == 64
-        assert all(c in '0123456789abcdef' for c in hash_value)
+        digest = hashlib.blake2b(file_path.encode(), digest_size=16).hexdigest()
+        assert hash_value == int(digest[:16], 16)
+        assert 0 <= hash_value < 2 ** 64
 
     def test_file_hash_deterministic(self, daemon_instance):
         """Test that same file produces same hash"""
@@ -342,6 +544,14 @@ class TestFileHash:
         hash2 = daemon_instance.get_file_hash("/video2.mp4")
         assert hash1 != hash2
 
+    def test_file_hash_memo_reset_on_discovery(self, daemon_instance):
+        """Test hashes are memoized between discoveries only"""
+        daemon_instance.get_file_hash("/video1.mp4")
+        assert "/video1.mp4" in daemon_instance._hash_cache
+
+        daemon_instance.discover_videos()
+        assert "/video1.mp4" not in daemon_instance._hash_cache
+
 
 class TestConversionTiming:
     """Test conversion timing tracking"""
@@ -394,7 +604,7 @@ class TestConversionTiming:
         config_file, state_dir = temp_config
         daemon = VideoConverterDaemon(str(config_file))
 
-        test_hash = 'a' * 64
+        test_hash = 0xaaaaaaaaaaaaaaaa
         daemon.processed_files.add(test_hash)
         daemon.conversion_times[test_hash] = {
             "timestamp": 1234567890,
@@ -407,9 +617,8 @@ class TestConversionTiming:
         with open(db_file, 'r') as f:
             data = json.load(f)
 
-        assert test_hash in data
-        assert data[test_hash]['duration_seconds'] == 42
-        assert data[test_hash]['timestamp'] == 1234567890
+        assert data['a' * 16]['duration_seconds'] == 42
+        assert data['a' * 16]['timestamp'] == 1234567890
 
     def test_load_old_format_processed_files(self, temp_config):
         """Test backward compatibility with old list format"""
@@ -421,10 +630,10 @@ class TestConversionTiming:
         with open(db_file, 'w') as f:
             json.dump(old_format, f)
 
-        # Load should succeed
+        # Load should succeed; SHA-256 keys are held for lazy migration
         daemon = VideoConverterDaemon(str(config_file))
-        assert len(daemon.processed_files) == 2
-        assert 'a' * 64 in daemon.processed_files
+        assert len(daemon._legacy_processed) == 2
+        assert b'\xaa' * 32 in daemon._legacy_processed
 
     def test_new_format_processed_files_with_timing(self, temp_config):
         """Test loading new format with timing data"""
@@ -433,8 +642,8 @@ class TestConversionTiming:
         # Create new format processed.json
         db_file = state_dir / 'processed.json'
         new_format = {
-            'a' * 64: {'timestamp': 1000000, 'duration_seconds': 30},
-            'b' * 64: {'timestamp': 1000030, 'duration_seconds': 45}
+            'a' * 16: {'timestamp': 1000000, 'duration_seconds': 30},
+            'b' * 16: {'timestamp': 1000030, 'duration_seconds': 45}
         }
         with open(db_file, 'w') as f:
             json.dump(new_format, f)
@@ -442,8 +651,30 @@ class TestConversionTiming:
         # Load should succeed and restore timing data
         daemon = VideoConverterDaemon(str(config_file))
         assert len(daemon.processed_files) == 2
-        assert daemon.conversion_times['a' * 64]['duration_seconds'] == 30
-        assert daemon.conversion_times['b' * 64]['duration_seconds'] == 45
+        assert daemon.conversion_times[0xaaaaaaaaaaaaaaaa]['duration_seconds'] == 30
+        assert daemon.conversion_times[0xbbbbbbbbbbbbbbbb]['duration_seconds'] == 45
+
+    def test_legacy_hash_migrated_on_lookup(self, temp_config, tmp_path):
+        """Test a SHA-256 key from an older version still marks the file processed"""
+        import hashlib
+        config_file, state_dir = temp_config
+        video = tmp_path / "old.mp4"
+        video.write_bytes(b"data")
+        legacy_hash = hashlib.sha256(str(video).encode()).hexdigest()
+        with open(state_dir / 'processed.json', 'w') as f:
+            json.dump({legacy_hash: {'timestamp': 1000, 'duration_seconds': 7}}, f)
+
+        daemon = VideoConverterDaemon(str(config_file))
+        assert daemon.should_process(video) is None
+
+        new_hash = daemon.get_file_hash(str(video))
+        assert new_hash in daemon.processed_files
+        assert daemon.conversion_times[new_hash]['duration_seconds'] == 7
+        assert not daemon._legacy_processed
+
+        daemon.save_processed_files()
+        with open(state_dir / 'processed.json') as f:
+            assert set(json.load(f)) == {format(new_hash, '016x')}
 
 
 class TestConfigValidationEdgeCases:
@@ -542,6 +773,32 @@ class TestConfigValidationEdgeCases:
             finally:
                 os.unlink(f.name)
 
+    def test_relative_log_file_rejected(self, minimal_config):
+        """Test that relative log_file is rejected"""
+        minimal_config['daemon']['log_file'] = 'daemon.log'
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            import yaml
+            yaml.dump(minimal_config, f)
+            f.flush()
+            try:
+                with pytest.raises(ConfigValidationError, match="log_file 'daemon.log' must be an absolute path"):
+                    VideoConverterDaemon(f.name)
+            finally:
+                os.unlink(f.name)
+
+    def test_invalid_min_free_space(self, minimal_config):
+        """Test that min_free_space_gb outside its range is rejected"""
+        minimal_config['processing']['min_free_space_gb'] = 500
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            import yaml
+            yaml.dump(minimal_config, f)
+            f.flush()
+            try:
+                with pytest.raises(ConfigValidationError, match="Invalid min_free_space_gb '500'. Must be 1-100."):
+                    VideoConverterDaemon(f.name)
+            finally:
+                os.unlink(f.name)
+
     def test_invalid_audio_codec(self, minimal_config):
         """Test that invalid audio codec is rejected"""
         minimal_config['conversion']['audio_codec'] = 'invalid_codec'
@@ -674,6 +931,247 @@ class TestFFmpegCommandBuilding:
 
         assert '-nostdin' in cmd
 
+    def test_ffmpeg_command_reports_progress_on_stdout(self, daemon_instance, tmp_path):
+        """Test that FFmpeg writes -progress to stdout for the stall watchdog"""
+        cmd = daemon_instance.build_ffmpeg_command(tmp_path / "in.mp4", tmp_path / "out.m4v")
+
+        idx = cmd.index('-progress')
+        assert cmd[idx + 1] == 'pipe:1'
+        assert idx < cmd.index('-i')
+
+    def test_ffmpeg_command_splits_threads_between_workers(self, daemon_instance, tmp_path):
+        """Test that each software encode gets its share of the CPUs"""
+        daemon_instance.encoder_threads = 4
+        cmd = daemon_instance.build_ffmpeg_command(tmp_path / "in.mp4", tmp_path / "out.m4v")
+        assert cmd[cmd.index('-threads') + 1] == '4'
+
+        daemon_instance.encoder_threads = None
+        cmd = daemon_instance.build_ffmpeg_command(tmp_path / "in.mp4", tmp_path / "out.m4v")
+        assert '-threads' not in cmd
+
+    def test_ffmpeg_command_cuda(self, daemon_instance, tmp_path):
+        """Test NVENC command uses GPU decode and -cq instead of -crf"""
+        daemon_instance.config['conversion']['hwaccel'] = 'cuda'
+        with patch.object(daemon_instance, '_probe_encoders',
+                          return_value={'h264_nvenc', 'libx264'}):
+            daemon_instance.hwaccel, daemon_instance.video_encoder = \
+                daemon_instance._select_video_encoder()
+
+        cmd = daemon_instance.build_ffmpeg_command(
+            tmp_path / "input.mp4", tmp_path / "output.m4v"
+        )
+
+        assert cmd[cmd.index('-hwaccel') + 1] == 'cuda'
+        assert cmd.index('-hwaccel') < cmd.index('-i')
+        assert cmd[cmd.index('-c:v') + 1] == 'h264_nvenc'
+        assert cmd[cmd.index('-cq') + 1] == '23'
+        assert cmd[cmd.index('-preset') + 1] == 'p5'  # mapped from 'slow'
+        assert '-crf' not in cmd
+
+    def test_ffmpeg_command_cuda_fallback(self, daemon_instance, tmp_path):
+        """Test missing NVENC encoder falls back to software encoding"""
+        daemon_instance.config['conversion']['hwaccel'] = 'cuda'
+        with patch.object(daemon_instance, '_probe_encoders', return_value={'libx264'}):
+            daemon_instance.hwaccel, daemon_instance.video_encoder = \
+                daemon_instance._select_video_encoder()
+
+        cmd = daemon_instance.build_ffmpeg_command(
+            tmp_path / "input.mp4", tmp_path / "output.m4v"
+        )
+
+        assert '-hwaccel' not in cmd
+        assert cmd[cmd.index('-c:v') + 1] == 'libx264'
+        assert cmd[cmd.index('-crf') + 1] == '23'
+
+    def test_ffmpeg_command_vaapi(self, daemon_instance, tmp_path):
+        """Test VAAPI command uploads frames and uses -qp without -preset"""
+        daemon_instance.config['conversion']['hwaccel'] = 'vaapi'
+        with patch('os.path.exists', return_value=True):
+            with patch.object(daemon_instance, '_probe_encoders',
+                              return_value={'h264_vaapi'}):
+                daemon_instance.hwaccel, daemon_instance.video_encoder = \
+                    daemon_instance._select_video_encoder()
+
+        cmd = daemon_instance.build_ffmpeg_command(
+            tmp_path / "input.mp4", tmp_path / "output.m4v"
+        )
+
+        assert cmd[cmd.index('-vaapi_device') + 1] == '/dev/dri/renderD128'
+        assert cmd[cmd.index('-vf') + 1] == 'format=nv12|vaapi,hwupload'
+        assert cmd[cmd.index('-c:v') + 1] == 'h264_vaapi'
+        assert cmd[cmd.index('-qp') + 1] == '23'
+        assert '-preset' not in cmd
+        assert '-crf' not in cmd
+
+    def test_vaapi_missing_device_falls_back(self, daemon_instance):
+        """Test a missing render node falls back without probing ffmpeg"""
+        daemon_instance.config['conversion']['hwaccel'] = 'vaapi'
+        with patch('os.path.exists', return_value=False):
+            with patch.object(daemon_instance, '_probe_encoders') as mock_probe:
+                result = daemon_instance._select_video_encoder()
+
+        assert result == ('none', 'libx264')
+        mock_probe.assert_not_called()
+
+    def test_ffmpeg_command_qsv(self, daemon_instance, tmp_path):
+        """Test QSV command uploads frames to the render node and uses -global_quality"""
+        daemon_instance.config['conversion']['hwaccel'] = 'qsv'
+        with patch('os.path.exists', return_value=True):
+            with patch.object(daemon_instance, '_probe_encoders',
+                              return_value={'h264_qsv'}):
+                daemon_instance.hwaccel, daemon_instance.video_encoder = \
+                    daemon_instance._select_video_encoder()
+
+        cmd = daemon_instance.build_ffmpeg_command(
+            tmp_path / "input.mp4", tmp_path / "output.m4v"
+        )
+
+        assert cmd[cmd.index('-init_hw_device') + 1] == \
+            'qsv=qs:hw,child_device=/dev/dri/renderD128'
+        assert cmd.index('-init_hw_device') < cmd.index('-i')
+        assert cmd[cmd.index('-c:v') + 1] == 'h264_qsv'
+        assert cmd[cmd.index('-global_quality') + 1] == '23'
+        assert cmd[cmd.index('-preset') + 1] == 'slow'
+        assert '-crf' not in cmd
+
+    def test_remux_copies_matching_streams(self, daemon_instance, tmp_path):
+        """Test streams already in the target codecs are copied, not re-encoded"""
+        daemon_instance.config['conversion']['remux_when_possible'] = True
+        probe = json.dumps({'streams': [
+            {'codec_type': 'video', 'codec_name': 'mjpeg', 'disposition': {'attached_pic': 1}},
+            {'codec_type': 'video', 'codec_name': 'h264', 'disposition': {'attached_pic': 0}},
+            {'codec_type': 'audio', 'codec_name': 'aac'},
+        ]})
+        with patch('subprocess.run', return_value=MagicMock(stdout=probe)):
+            cmd = daemon_instance.build_ffmpeg_command(
+                tmp_path / "input.mp4", tmp_path / "output.m4v"
+            )
+
+        assert cmd[cmd.index('-c:v') + 1] == 'copy'
+        assert cmd[cmd.index('-c:a') + 1] == 'copy'
+        assert '-crf' not in cmd and '-b:a' not in cmd
+
+    def test_remux_reencodes_other_codecs(self, daemon_instance, tmp_path):
+        """Test a non-matching video codec is encoded while matching audio is copied"""
+        daemon_instance.config['conversion']['remux_when_possible'] = True
+        probe = json.dumps({'streams': [
+            {'codec_type': 'video', 'codec_name': 'mpeg2video'},
+            {'codec_type': 'audio', 'codec_name': 'aac'},
+        ]})
+        with patch('subprocess.run', return_value=MagicMock(stdout=probe)):
+            cmd = daemon_instance.build_ffmpeg_command(
+                tmp_path / "input.mp4", tmp_path / "output.m4v"
+            )
+
+        assert cmd[cmd.index('-c:v') + 1] == 'libx264'
+        assert cmd[cmd.index('-c:a') + 1] == 'copy'
+
+    def test_remux_probe_failure_reencodes(self, daemon_instance, tmp_path):
+        """Test a failed ffprobe falls back to a full encode"""
+        daemon_instance.config['conversion']['remux_when_possible'] = True
+        with patch('subprocess.run', side_effect=OSError("ffprobe not found")):
+            cmd = daemon_instance.build_ffmpeg_command(
+                tmp_path / "input.mp4", tmp_path / "output.m4v"
+            )
+
+        assert cmd[cmd.index('-c:v') + 1] == 'libx264'
+        assert cmd[cmd.index('-c:a') + 1] == 'aac'
+
+    def test_hw_presets_cover_allowed_presets(self):
+        """Test every allowed preset has an NVENC and a QSV equivalent"""
+        from video_converter_daemon import ALLOWED_PRESETS, NVENC_PRESETS, QSV_PRESETS
+        assert set(NVENC_PRESETS) == ALLOWED_PRESETS
+        assert set(QSV_PRESETS) == ALLOWED_PRESETS
+
+    def test_hwaccel_auto_prefers_cuda(self, daemon_instance):
+        """Test auto picks NVENC when the NVIDIA device and encoder exist"""
+        daemon_instance.config['conversion']['hwaccel'] = 'auto'
+        with patch('os.path.exists', return_value=True):
+            with patch.object(daemon_instance, '_probe_encoders',
+                              return_value={'h264_nvenc', 'h264_vaapi', 'libx264'}):
+                with patch.object(daemon_instance, '_test_encode', return_value=True):
+                    result = daemon_instance._select_video_encoder()
+
+        assert result == ('cuda', 'h264_nvenc')
+
+    def test_hwaccel_auto_skips_missing_device(self, daemon_instance):
+        """Test auto ignores encoders whose device node is absent"""
+        daemon_instance.config['conversion']['hwaccel'] = 'auto'
+        present = {'/dev/dri/renderD128'}
+        with patch('os.path.exists', side_effect=lambda p: p in present):
+            with patch.object(daemon_instance, '_probe_encoders',
+                              return_value={'h264_nvenc', 'h264_vaapi', 'libx264'}):
+                with patch.object(daemon_instance, '_test_encode', return_value=True):
+                    result = daemon_instance._select_video_encoder()
+
+        assert result == ('vaapi', 'h264_vaapi')
+
+    def test_hwaccel_auto_prefers_qsv_over_vaapi(self, daemon_instance):
+        """Test auto picks QSV on the render node when its test encode passes"""
+        daemon_instance.config['conversion']['hwaccel'] = 'auto'
+        present = {'/dev/dri/renderD128'}
+        with patch('os.path.exists', side_effect=lambda p: p in present):
+            with patch.object(daemon_instance, '_probe_encoders',
+                              return_value={'h264_qsv', 'h264_vaapi', 'libx264'}):
+                with patch.object(daemon_instance, '_test_encode', return_value=True):
+                    result = daemon_instance._select_video_encoder()
+
+        assert result == ('qsv', 'h264_qsv')
+
+    def test_hwaccel_auto_falls_through_failed_test_encode(self, daemon_instance):
+        """Test a render node without a working driver falls back to software"""
+        daemon_instance.config['conversion']['hwaccel'] = 'auto'
+        present = {'/dev/dri/renderD128'}
+        with patch('os.path.exists', side_effect=lambda p: p in present):
+            with patch.object(daemon_instance, '_probe_encoders',
+                              return_value={'h264_nvenc', 'h264_qsv', 'h264_vaapi'}):
+                with patch.object(daemon_instance, '_test_encode',
+                                  return_value=False) as mock_test:
+                    result = daemon_instance._select_video_encoder()
+
+        assert result == ('none', 'libx264')
+        assert [c[0][0] for c in mock_test.call_args_list] == ['qsv', 'vaapi']
+
+    def test_test_encode_uses_backend_device(self, daemon_instance):
+        """Test the test encode sets up the device and reports ffmpeg failures"""
+        with patch('subprocess.run',
+                   return_value=MagicMock(returncode=0, stderr='')) as mock_run:
+            assert daemon_instance._test_encode('vaapi', 'h264_vaapi') is True
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index('-vaapi_device') + 1] == daemon_instance.vaapi_device
+        assert cmd[cmd.index('-c:v') + 1] == 'h264_vaapi'
+        assert cmd[cmd.index('-frames:v') + 1] == '1'
+
+        with patch('subprocess.run',
+                   return_value=MagicMock(returncode=1, stderr='No VA display found')):
+            assert daemon_instance._test_encode('vaapi', 'h264_vaapi') is False
+
+    def test_hwaccel_auto_without_gpu(self, daemon_instance):
+        """Test auto uses software encoding without probing when no device exists"""
+        daemon_instance.config['conversion']['hwaccel'] = 'auto'
+        with patch('os.path.exists', return_value=False):
+            with patch.object(daemon_instance, '_probe_encoders') as mock_probe:
+                result = daemon_instance._select_video_encoder()
+
+        assert result == ('none', 'libx264')
+        mock_probe.assert_not_called()
+
+    def test_probe_encoders_parses_output(self, daemon_instance):
+        """Test encoder names are parsed from `ffmpeg -encoders` output"""
+        output = (
+            "Encoders:\n"
+            " V..... = Video\n"
+            " ------\n"
+            " V....D libx264              libx264 H.264 / AVC\n"
+            " V....D h264_nvenc           NVIDIA NVENC H.264 encoder\n"
+            " A....D aac                  AAC (Advanced Audio Coding)\n"
+        )
+        with patch('subprocess.run', return_value=MagicMock(stdout=output)):
+            encoders = daemon_instance._probe_encoders()
+
+        assert {'libx264', 'h264_nvenc'} <= encoders
+        assert 'aac' not in encoders
+
 
 # ============================================================================
 # PHASE 1: CRITICAL PATH TESTING (HIGH PRIORITY)
@@ -739,6 +1237,22 @@ class TestSignalHandling:
         daemon_instance.handle_shutdown(signal.SIGINT, None)
         assert daemon_instance.running is False
 
+    def test_setup_logging_writes_through_queue(self, daemon_instance):
+        """Test log records are queued and written by a listener thread"""
+        import logging
+        from logging.handlers import QueueHandler
+        root = logging.getLogger()
+        with patch.object(root, 'handlers', []):
+            with patch('atexit.register') as mock_register:
+                with patch('logging.basicConfig') as mock_basic:
+                    daemon_instance.setup_logging()
+
+        handlers = mock_basic.call_args[1]['handlers']
+        assert len(handlers) == 1 and isinstance(handlers[0], QueueHandler)
+        assert logging.logThreads is False and logging.logProcesses is False
+        stop = mock_register.call_args[0][0]
+        stop()  # the listener thread is running; stop it
+
 
 class TestDryRunMode:
     """Test dry-run mode functionality"""
@@ -799,6 +1313,8 @@ class TestDryRunMode:
         assert not (tmp_path / "test.m4v").exists()
         # Verify file was marked as processed
         assert daemon_instance.get_file_hash(str(video)) in daemon_instance.processed_files
+        # The worker pool used by the batch is shut down on exit
+        assert daemon_instance._executor is None
 
 
 class TestMainLoop:
@@ -849,7 +1365,7 @@ class TestMainLoop:
 
     def test_run_main_loop_graceful_shutdown(self, daemon_instance):
         """Test main loop exits gracefully when running=False"""
-        with patch('time.sleep'):
+        with patch.object(daemon_instance._shutdown, 'wait', return_value=False):
             with patch.object(daemon_instance, 'discover_videos', return_value=[]):
                 with patch.object(daemon_instance, 'process_batch') as mock_batch:
                     # Simulate shutdown after first iteration
@@ -875,17 +1391,18 @@ class TestMainLoop:
             daemon_instance.running = False
             return []
 
-        with patch('time.sleep'):
+        with patch.object(daemon_instance._shutdown, 'wait', return_value=False) as mock_wait:
             with patch.object(daemon_instance, 'discover_videos', side_effect=discover_side_effect) as mock_discover:
                 with patch.object(daemon_instance, 'process_batch'):
                     daemon_instance.run()
 
                     # Verify continued after exception (called twice)
                     assert mock_discover.call_count == 2
+                    mock_wait.assert_any_call(30)
 
     def test_run_sleep_interruption(self, daemon_instance):
         """Test loop doesn't execute when running=False"""
-        with patch('time.sleep') as mock_sleep:
+        with patch.object(daemon_instance._shutdown, 'wait') as mock_wait:
             with patch.object(daemon_instance, 'discover_videos', return_value=[]) as mock_discover:
                 with patch.object(daemon_instance, 'process_batch'):
                     # Stop immediately
@@ -894,7 +1411,69 @@ class TestMainLoop:
 
                     # Should not enter the loop at all
                     assert mock_discover.call_count == 0
-                    assert mock_sleep.call_count == 0
+                    assert mock_wait.call_count == 0
+
+    def test_run_reuses_cache_without_rechecking_files(self, daemon_instance):
+        """Test a fresh cache is reused after a batch with nothing pending"""
+        cycles = 0
+
+        def batch(videos):
+            nonlocal cycles
+            cycles += 1
+            if cycles == 2:
+                daemon_instance.running = False
+            return 0
+
+        with patch.object(daemon_instance._shutdown, 'wait', return_value=False):
+            with patch.object(daemon_instance, 'discover_videos',
+                              return_value=[Path('/videos/a.mp4')]) as mock_discover:
+                with patch.object(daemon_instance, 'process_batch', side_effect=batch):
+                    with patch.object(daemon_instance, 'should_process') as mock_check:
+                        daemon_instance.run()
+
+        assert cycles == 2
+        assert mock_discover.call_count == 1
+        mock_check.assert_not_called()
+
+    def test_run_rediscovers_after_failed_batch(self, daemon_instance):
+        """Test the cache is not reused after a batch raised"""
+        cycles = 0
+
+        def batch(videos):
+            nonlocal cycles
+            cycles += 1
+            if cycles == 2:
+                raise RuntimeError("batch failed")
+            if cycles == 3:
+                daemon_instance.running = False
+            return 0
+
+        with patch.object(daemon_instance._shutdown, 'wait', return_value=False):
+            with patch.object(daemon_instance, 'discover_videos',
+                              return_value=[Path('/videos/a.mp4')]) as mock_discover:
+                with patch.object(daemon_instance, 'process_batch', side_effect=batch):
+                    daemon_instance.run()
+
+        assert cycles == 3
+        assert mock_discover.call_count == 2
+
+    def test_shutdown_wakes_sleeping_loop(self, daemon_instance):
+        """Test a shutdown during the scan interval ends the loop without waiting it out"""
+        import signal
+        import threading
+        import time
+        with patch.object(daemon_instance, 'discover_videos', return_value=[]):
+            with patch.object(daemon_instance, 'process_batch'):
+                timer = threading.Timer(
+                    0.1, daemon_instance.handle_shutdown, args=(signal.SIGTERM, None)
+                )
+                timer.start()
+                start = time.monotonic()
+                daemon_instance.run()
+                timer.join()
+
+        # scan_interval is 300 s; the loop must return as soon as shutdown is set
+        assert time.monotonic() - start < 5
 
 
 class TestConversionErrors:
@@ -949,7 +1528,7 @@ class TestConversionErrors:
         video = tmp_path / "huge_video.mp4"
         video.touch()
 
-        with patch('subprocess.run') as mock_run:
+        with patch.object(daemon_instance, '_run_ffmpeg') as mock_run:
             mock_run.side_effect = subprocess.TimeoutExpired(
                 cmd=['ffmpeg'], timeout=86400
             )
@@ -962,8 +1541,8 @@ class TestConversionErrors:
         video = tmp_path / "corrupt.mp4"
         video.touch()
 
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=1, stderr="Invalid data")
+        with patch.object(daemon_instance, '_run_ffmpeg') as mock_run:
+            mock_run.return_value = (1, "Invalid data")
 
             result = daemon_instance.convert_video(video)
             assert result is False
@@ -979,6 +1558,49 @@ class TestConversionErrors:
             result = daemon_instance.convert_video(video)
             assert result is False
 
+    def test_run_ffmpeg_returns_stderr_tail(self, daemon_instance, tmp_path):
+        """Test failed command returns exit code and only the end of stderr"""
+        cmd = ['sh', '-c', 'head -c 5000 /dev/zero | tr "\\\\0" x >&2; echo END >&2; exit 3']
+
+        returncode, stderr_tail = daemon_instance._run_ffmpeg(cmd)
+
+        assert returncode == 3
+        assert stderr_tail.endswith("END\n")
+        assert len(stderr_tail) == 2000
+
+    def test_run_ffmpeg_timeout_kills_process(self, daemon_instance):
+        """Test a command exceeding the timeout is killed and re-raised"""
+        import subprocess
+        with patch('video_converter_daemon.MAX_CONVERSION_TIMEOUT', 0.2):
+            with pytest.raises(subprocess.TimeoutExpired):
+                daemon_instance._run_ffmpeg(['sh', '-c', 'echo start >&2; exec sleep 30'])
+
+    def test_run_ffmpeg_stall_kills_process(self, daemon_instance):
+        """Test a command that stops reporting progress is killed before the overall timeout"""
+        import subprocess
+        import time
+        daemon_instance.stall_timeout = 0.3
+        start = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired) as excinfo:
+            daemon_instance._run_ffmpeg(['sh', '-c', 'echo out_time_us=1; exec sleep 30'])
+        assert excinfo.value.timeout == 0.3
+        assert time.monotonic() - start < 5
+
+    def test_run_ffmpeg_progress_prevents_stall(self, daemon_instance):
+        """Test advancing progress output keeps a long command alive"""
+        daemon_instance.stall_timeout = 0.3
+        cmd = ['sh', '-c', 'for i in 1 2 3 4 5 6; do echo out_time_us=$i; '
+                           'echo progress=continue; sleep 0.1; done']
+        returncode, _ = daemon_instance._run_ffmpeg(cmd)
+        assert returncode == 0
+
+    def test_run_ffmpeg_success_skips_stderr(self, daemon_instance, tmp_path):
+        """Test successful command returns no stderr"""
+        returncode, stderr_tail = daemon_instance._run_ffmpeg(['sh', '-c', 'echo noise >&2'])
+
+        assert returncode == 0
+        assert stderr_tail == ''
+
 
 # ============================================================================
 # PHASE 2: ERROR PATH TESTING (MEDIUM PRIORITY)
@@ -1064,6 +1686,7 @@ class TestDiscoveryErrors:
         """Test exclude patterns are applied"""
         daemon_instance.config['directories'] = [str(tmp_path)]
         daemon_instance.config['processing']['exclude_patterns'] = ['*.backup.*']
+        daemon_instance._bind_config()
 
         # Create test files
         (tmp_path / "good.mp4").touch()
@@ -1093,6 +1716,192 @@ class TestDiscoveryErrors:
         # Should not include symlinked file outside directory
         assert len(videos) == 0
 
+    def test_exclude_regex_matches_path_match(self):
+        """Test compiled exclude patterns agree with Path.match()"""
+        patterns = [
+            '*.converted.*', '*/.backup/*', '/media/x/*.mp4',
+            'a?c.mp4', '[!a]*.mkv', 'sub/*',
+        ]
+        paths = [
+            '/media/a.converted.mp4', '/media/a.converted/b.mp4',
+            '/m/.backup/x.mp4', '/m/.backup/d/x.mp4',
+            '/media/x/y.mp4', '/media/x/z/y.mp4',
+            '/q/abc.mp4', '/q/a/c.mp4', '/a.mkv', '/q/b.mkv',
+            '/a/sub/x.mp4', '/sub/x/y.mp4',
+        ]
+        for pattern in patterns:
+            exclude_re = compile_exclude_patterns([pattern])
+            for path in paths:
+                assert bool(exclude_re.search(path)) == Path(path).match(pattern), \
+                    (pattern, path)
+
+    def test_exclude_regex_empty(self):
+        """Test no patterns compile to None"""
+        assert compile_exclude_patterns([]) is None
+
+    def test_discover_videos_skips_symlinks(self, daemon_instance, tmp_path):
+        """Test symlinks are skipped without resolving any path"""
+        video_dir = tmp_path / "videos"
+        video_dir.mkdir()
+        (video_dir / "plain.mp4").touch()
+        (video_dir / "link.mp4").symlink_to(video_dir / "plain.mp4")
+        daemon_instance.config['directories'] = [str(video_dir)]
+
+        with patch.object(daemon_instance, '_is_safe_path') as mock_safe:
+            videos = daemon_instance.discover_videos()
+
+        assert [v.name for v in videos] == ['plain.mp4']
+        mock_safe.assert_not_called()
+
+    def test_discover_videos_multiple_roots(self, daemon_instance, tmp_path):
+        """Test roots scanned in parallel are merged in configured order"""
+        roots = []
+        for name in ('a', 'b', 'c'):
+            root = tmp_path / name
+            root.mkdir()
+            (root / f"{name}.mp4").touch()
+            roots.append(str(root))
+        daemon_instance.config['directories'] = roots + ['/nonexistent/path']
+
+        videos = daemon_instance.discover_videos()
+
+        assert [v.name for v in videos] == ['a.mp4', 'b.mp4', 'c.mp4']
+
+    def test_discovery_cap_shared_across_roots(self, daemon_instance, tmp_path):
+        """Test parallel walks all stop once the combined file cap is reached"""
+        roots = []
+        for name in ('a', 'b', 'c'):
+            for i in range(5):
+                sub = tmp_path / name / f"d{i}"
+                sub.mkdir(parents=True)
+                (sub / f"{name}{i}.mp4").touch()
+            roots.append(str(tmp_path / name))
+        daemon_instance.config['directories'] = roots
+
+        real_scan = daemon_instance._scan_local_dir
+        with patch('video_converter_daemon.MAX_DISCOVERED_FILES', 2):
+            with patch.object(daemon_instance, '_scan_local_dir',
+                              side_effect=real_scan) as mock_scan:
+                videos = daemon_instance.discover_videos()
+
+        assert len(videos) == 2
+        # 18 directories in total; each walk gives up soon after the cap is hit
+        assert mock_scan.call_count < 18
+
+
+class TestDiscoveryCache:
+    """Test mtime-based directory listing cache"""
+
+    @pytest.fixture
+    def daemon_instance(self, tmp_path):
+        """Create a daemon watching tmp_path/videos"""
+        work_dir = tmp_path / "work"
+        work_dir.mkdir()
+        state_dir = tmp_path / "state"
+        state_dir.mkdir()
+        log_dir = tmp_path / "logs"
+        log_dir.mkdir()
+        log_file = log_dir / "daemon.log"
+        (tmp_path / "videos" / "sub").mkdir(parents=True)
+
+        config = {
+            'directories': [str(tmp_path / "videos")],
+            'conversion': {
+                'codec': 'libx264',
+                'crf': 23,
+                'preset': 'medium',
+                'audio_codec': 'aac',
+                'audio_bitrate': '128k',
+                'extra_options': [],
+            },
+            'processing': {
+                'work_dir': str(work_dir),
+                'state_dir': str(state_dir),
+                'include_extensions': ['mp4'],
+                'exclude_patterns': [],
+                'keep_original': True,
+            },
+            'daemon': {
+                'log_level': 'INFO',
+                'log_file': str(log_file),
+                'scan_interval': 300,
+                'max_workers': 2,
+            },
+        }
+
+        config_file = tmp_path / "config.yaml"
+        import yaml
+        with open(config_file, 'w') as f:
+            yaml.dump(config, f)
+
+        return VideoConverterDaemon(str(config_file))
+
+    @staticmethod
+    def _age_dirs(*dirs):
+        """Backdate directory mtimes so they are outside the racy window"""
+        for d in dirs:
+            os.utime(d, (1000000000, 1000000000))
+
+    def test_unchanged_directories_are_not_relisted(self, daemon_instance, tmp_path):
+        """Test cached listings are reused when directory mtimes are unchanged"""
+        videos_dir = tmp_path / "videos"
+        (videos_dir / "sub" / "a.mp4").touch()
+        self._age_dirs(videos_dir, videos_dir / "sub")
+
+        first = daemon_instance.discover_videos()
+
+        with patch('os.scandir', side_effect=AssertionError("relisted")):
+            second = daemon_instance.discover_videos()
+
+        assert first == second == [videos_dir / "sub" / "a.mp4"]
+
+    def test_changed_directory_is_relisted(self, daemon_instance, tmp_path):
+        """Test a new file is found once its directory mtime changes"""
+        videos_dir = tmp_path / "videos"
+        (videos_dir / "a.mp4").touch()
+        self._age_dirs(videos_dir, videos_dir / "sub")
+        daemon_instance.discover_videos()
+
+        (videos_dir / "sub" / "b.mp4").touch()
+        videos = daemon_instance.discover_videos()
+
+        assert sorted(v.name for v in videos) == ['a.mp4', 'b.mp4']
+
+    def test_recently_modified_directory_not_cached(self, daemon_instance, tmp_path):
+        """Test directories inside the racy mtime window are always relisted"""
+        (tmp_path / "videos" / "a.mp4").touch()
+
+        daemon_instance.discover_videos()
+
+        assert str(tmp_path / "videos") not in daemon_instance._dir_cache
+
+    def test_cache_persisted_across_restarts(self, daemon_instance, tmp_path):
+        """Test the cache is saved to state_dir and reloaded"""
+        videos_dir = tmp_path / "videos"
+        (videos_dir / "a.mp4").touch()
+        self._age_dirs(videos_dir, videos_dir / "sub")
+        daemon_instance.discover_videos()
+
+        assert (tmp_path / "state" / "discovery_cache.json").exists()
+
+        daemon2 = VideoConverterDaemon(str(tmp_path / "config.yaml"))
+        with patch('os.scandir', side_effect=AssertionError("relisted")):
+            assert daemon2.discover_videos() == [videos_dir / "a.mp4"]
+
+    def test_cache_invalidated_by_filter_change(self, daemon_instance, tmp_path):
+        """Test changing exclude patterns discards cached listings"""
+        videos_dir = tmp_path / "videos"
+        (videos_dir / "a.mp4").touch()
+        (videos_dir / "skip.backup.mp4").touch()
+        self._age_dirs(videos_dir, videos_dir / "sub")
+        assert len(daemon_instance.discover_videos()) == 2
+
+        daemon_instance.config['processing']['exclude_patterns'] = ['*.backup.*']
+        daemon_instance._bind_config()
+        videos = daemon_instance.discover_videos()
+
+        assert videos == [videos_dir / "a.mp4"]
+
 
 class TestFileProcessingChecks:
     """Test file processing validation"""
@@ -1148,7 +1957,7 @@ class TestFileProcessingChecks:
         file_hash = daemon_instance.get_file_hash(str(video))
         daemon_instance.processed_files.add(file_hash)
 
-        assert daemon_instance.should_process(video) is False
+        assert daemon_instance.should_process(video) is None
 
     def test_should_process_currently_converting(self, daemon_instance, tmp_path):
         """Test file currently being converted is skipped"""
@@ -1158,7 +1967,7 @@ class TestFileProcessingChecks:
         file_hash = daemon_instance.get_file_hash(str(video))
         daemon_instance.converting.add(file_hash)
 
-        assert daemon_instance.should_process(video) is False
+        assert daemon_instance.should_process(video) is None
 
     def test_should_process_output_exists(self, daemon_instance, tmp_path):
         """Test file with existing output is skipped"""
@@ -1167,14 +1976,17 @@ class TestFileProcessingChecks:
         output = tmp_path / "test.m4v"
         output.touch()
 
-        assert daemon_instance.should_process(video) is False
+        assert daemon_instance.should_process(video) is None
 
     def test_should_process_already_m4v(self, daemon_instance, tmp_path):
         """Test .m4v files are skipped"""
         video = tmp_path / "test.m4v"
         video.touch()
 
-        assert daemon_instance.should_process(video) is False
+        with patch.object(daemon_instance, 'get_file_hash') as mock_hash:
+            assert daemon_instance.should_process(video) is None
+        # Rejected on the name alone, before hashing or stat()
+        mock_hash.assert_not_called()
 
     def test_should_process_exceeds_size_limit(self, daemon_instance, tmp_path):
         """Test files exceeding size limit are skipped"""
@@ -1184,14 +1996,14 @@ class TestFileProcessingChecks:
         with patch.object(Path, 'stat') as mock_stat:
             mock_stat.return_value = MagicMock(st_size=101 * 1024**3)  # 101 GB
 
-            assert daemon_instance.should_process(video) is False
+            assert daemon_instance.should_process(video) is None
 
     def test_should_process_empty_file(self, daemon_instance, tmp_path):
         """Test empty files are skipped"""
         video = tmp_path / "empty.mp4"
         video.touch()
 
-        assert daemon_instance.should_process(video) is False
+        assert daemon_instance.should_process(video) is None
 
     def test_should_process_stat_error(self, daemon_instance, tmp_path):
         """Test OSError during stat is handled"""
@@ -1206,7 +2018,7 @@ class TestFileProcessingChecks:
             return original_stat(self_path, *args, **kwargs)
 
         with patch.object(Path, 'stat', stat_side_effect):
-            assert daemon_instance.should_process(video) is False
+            assert daemon_instance.should_process(video) is None
 
 
 class TestConversionEdgeCases:
@@ -1292,8 +2104,8 @@ class TestConversionEdgeCases:
         video = tmp_path / "test.mp4"
         video.touch()
 
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
+        with patch.object(daemon_instance, '_run_ffmpeg') as mock_run:
+            mock_run.return_value = (0, '')
 
             with patch.object(Path, 'is_file', return_value=False):
                 result = daemon_instance.convert_video(video)
@@ -1305,14 +2117,14 @@ class TestConversionEdgeCases:
         video.write_bytes(b"video data")
         work_dir = Path(daemon_instance.config['processing']['work_dir'])
         file_hash = daemon_instance.get_file_hash(str(video))
-        temp_output = work_dir / f"{file_hash}_output.m4v"
+        temp_output = work_dir / f"{file_hash:016x}_output.m4v"
 
         def fake_ffmpeg(*args, **kwargs):
             # Create the temp output file to simulate successful conversion
             temp_output.write_bytes(b"converted data")
-            return MagicMock(returncode=0)
+            return 0, ''
 
-        with patch('subprocess.run', side_effect=fake_ffmpeg):
+        with patch.object(daemon_instance, '_run_ffmpeg', side_effect=fake_ffmpeg):
             with patch('os.utime') as mock_utime:
                 mock_utime.side_effect = OSError("Permission denied")
 
@@ -1326,14 +2138,15 @@ class TestConversionEdgeCases:
         video = tmp_path / "test.mp4"
         video.write_bytes(b"video data")
         daemon_instance.config['processing']['keep_original'] = False
+        daemon_instance._bind_config()
         work_dir = Path(daemon_instance.config['processing']['work_dir'])
         file_hash = daemon_instance.get_file_hash(str(video))
-        temp_output = work_dir / f"{file_hash}_output.m4v"
+        temp_output = work_dir / f"{file_hash:016x}_output.m4v"
 
         def fake_ffmpeg(*args, **kwargs):
             # Create the temp output file to simulate successful conversion
             temp_output.write_bytes(b"converted data")
-            return MagicMock(returncode=0)
+            return 0, ''
 
         original_unlink = Path.unlink
 
@@ -1342,12 +2155,62 @@ class TestConversionEdgeCases:
                 raise OSError("Permission denied")
             return original_unlink(self_path, *args, **kwargs)
 
-        with patch('subprocess.run', side_effect=fake_ffmpeg):
+        with patch.object(daemon_instance, '_run_ffmpeg', side_effect=fake_ffmpeg):
             with patch.object(Path, 'unlink', selective_unlink):
                 result = daemon_instance.convert_video(video)
                 # Should log error but still mark as processed
                 assert result is True
 
+    def test_convert_video_reuses_source_stat(self, daemon_instance, tmp_path):
+        """Test timestamps come from the stat passed in by should_process"""
+        video = tmp_path / "test.mp4"
+        video.write_bytes(b"video data")
+        os.utime(video, (1000000, 1000000))
+        work_dir = Path(daemon_instance.config['processing']['work_dir'])
+        file_hash = daemon_instance.get_file_hash(str(video))
+        temp_output = work_dir / f"{file_hash:016x}_output.m4v"
+
+        source_stat = daemon_instance.should_process(video)
+        assert source_stat is not None
+        # A fresh stat would now see a different mtime
+        os.utime(video, (2000000, 2000000))
+
+        def fake_ffmpeg(*args, **kwargs):
+            temp_output.write_bytes(b"converted data")
+            return 0, ''
+
+        with patch.object(daemon_instance, '_run_ffmpeg', side_effect=fake_ffmpeg):
+            result = daemon_instance.convert_video(video, file_hash, source_stat)
+
+        assert result is True
+        assert os.stat(video.with_suffix('.m4v')).st_mtime == 1000000
+
+    def test_move_output_cross_device(self, daemon_instance, tmp_path):
+        """Test output is copied then removed when rename hits EXDEV"""
+        src = tmp_path / "work" / "out.m4v"
+        src.write_bytes(b"converted" * 1000)
+        dst = tmp_path / "final.m4v"
+
+        with patch('os.replace', side_effect=OSError(errno.EXDEV, "cross-device")):
+            daemon_instance._move_output(src, dst)
+
+        assert dst.read_bytes() == b"converted" * 1000
+        assert not src.exists()
+
+    def test_move_output_copy_file_range_unsupported(self, daemon_instance, tmp_path):
+        """Test fallback to a userspace copy when copy_file_range is refused"""
+        src = tmp_path / "work" / "out.m4v"
+        src.write_bytes(b"converted")
+        dst = tmp_path / "final.m4v"
+
+        with patch('os.replace', side_effect=OSError(errno.EXDEV, "cross-device")):
+            with patch('os.copy_file_range', create=True,
+                       side_effect=OSError(errno.ENOSYS, "unsupported")):
+                daemon_instance._move_output(src, dst)
+
+        assert dst.read_bytes() == b"converted"
+        assert not src.exists()
+
 
 # ============================================================================
 # PHASE 3: VALIDATION & CLEANUP TESTING (LOW-MEDIUM PRIORITY)
@@ -1506,7 +2369,7 @@ class TestProcessedFilesErrorHandling:
         config_file, state_dir = temp_config
         daemon = VideoConverterDaemon(str(config_file))
 
-        daemon.processed_files.add('a' * 64)
+        daemon.processed_files.add(0xaaaaaaaaaaaaaaaa)
 
         with patch('os.open') as mock_open:
             mock_open.side_effect = OSError("Disk full")
@@ -1647,6 +2510,76 @@ class TestBatchProcessingErrors:
             daemon_instance.process_batch([video])
             # No assertion needed, just verify no crash
 
+    def test_process_batch_hashes_once(self, daemon_instance, tmp_path):
+        """Test the path hash is computed once and passed to convert_video"""
+        video = tmp_path / "test.mp4"
+        video.write_bytes(b"data")
+
+        with patch.object(daemon_instance, 'get_file_hash',
+                          wraps=daemon_instance.get_file_hash) as mock_hash:
+            with patch.object(daemon_instance, 'convert_video',
+                              return_value=True) as mock_convert:
+                daemon_instance.process_batch([video])
+
+        mock_hash.assert_called_once_with(str(video))
+        expected_hash = daemon_instance.get_file_hash(str(video))
+        mock_convert.assert_called_once()
+        args = mock_convert.call_args[0]
+        assert args[:2] == (video, expected_hash)
+        assert args[2].st_size == 4  # stat from should_process is reused
+
+    def test_process_batch_submits_largest_first(self, daemon_instance, tmp_path):
+        """Test a batch is dispatched largest file first"""
+        small = tmp_path / "small.mp4"
+        small.write_bytes(b"x" * 10)
+        large = tmp_path / "large.mp4"
+        large.write_bytes(b"x" * 1000)
+        medium = tmp_path / "medium.mp4"
+        medium.write_bytes(b"x" * 100)
+
+        daemon_instance._executor = MagicMock()
+        future = MagicMock()
+        future.result.return_value = True
+        daemon_instance._executor.submit.return_value = future
+        with patch('video_converter_daemon.as_completed', side_effect=lambda fs: list(fs)):
+            daemon_instance.process_batch([small, large, medium])
+
+        submitted = [c[0][1] for c in daemon_instance._executor.submit.call_args_list]
+        assert submitted == [large, medium, small]
+
+    def test_process_batch_counts_unconverted(self, daemon_instance, tmp_path):
+        """Test the return value counts failed and raising conversions"""
+        videos = []
+        for name in ("ok.mp4", "failed.mp4", "raised.mp4"):
+            video = tmp_path / name
+            video.write_bytes(b"data")
+            videos.append(video)
+
+        def convert(video, file_hash=None, source_stat=None):
+            if video.name == "raised.mp4":
+                raise RuntimeError("worker failure")
+            return video.name == "ok.mp4"
+
+        with patch.object(daemon_instance, 'convert_video', side_effect=convert):
+            assert daemon_instance.process_batch(videos) == 2
+        assert daemon_instance.process_batch([]) == 0
+
+    def test_process_batch_reuses_executor(self, daemon_instance, tmp_path):
+        """Test batches share one worker pool instead of creating one per scan"""
+        first = tmp_path / "first.mp4"
+        first.write_bytes(b"data")
+        second = tmp_path / "second.mp4"
+        second.write_bytes(b"data")
+
+        with patch.object(daemon_instance, 'convert_video', return_value=True):
+            daemon_instance.process_batch([first])
+            executor = daemon_instance._executor
+            daemon_instance.process_batch([second])
+
+        assert executor is not None
+        assert daemon_instance._executor is executor
+        executor.shutdown(wait=True)
+
 
 class TestMainEntryPoint:
     """Test main entry point argument parsing and error handling"""
@@ -1869,6 +2802,20 @@ class TestRemoteConfigValidation:
         with pytest.raises(ConfigValidationError, match="remote.transfer_timeout"):
             VideoConverterDaemon(config_file, validate_only=True)
 
+    def test_remote_max_connections_out_of_range(self, tmp_path):
+        """Test remote.max_connections outside 1-8 is rejected"""
+        config = _make_remote_config(tmp_path, {'max_connections': 9})
+        config_file = _write_config(tmp_path, config)
+        with pytest.raises(ConfigValidationError, match="remote.max_connections"):
+            VideoConverterDaemon(config_file, validate_only=True)
+
+    def test_remote_sftp_max_requests_out_of_range(self, tmp_path):
+        """Test remote.sftp_max_requests outside 16-4096 is rejected"""
+        config = _make_remote_config(tmp_path, {'sftp_max_requests': 8})
+        config_file = _write_config(tmp_path, config)
+        with pytest.raises(ConfigValidationError, match="remote.sftp_max_requests"):
+            VideoConverterDaemon(config_file, validate_only=True)
+
     def test_remote_disabled_skips_validation(self, tmp_path):
         """Test disabled remote section doesn't trigger remote validation"""
         config = _make_remote_config(tmp_path, {'enabled': False, 'host': ''})
@@ -1906,6 +2853,63 @@ class TestRemotePathValidation:
         from sftp_ops import validate_remote_path
         assert validate_remote_path('/etc/passwd', ['/media']) is False
 
+
+class TestRemoteListing:
+    """Test remote discovery via sftp_list_videos"""
+
+    @staticmethod
+    def _attr(name, mode):
+        import paramiko
+        attr = paramiko.SFTPAttributes()
+        attr.filename = name
+        attr.st_mode = mode
+        return attr
+
+    def test_fnmatch_patterns_match_like_fnmatch(self):
+        """Test the combined regex agrees with fnmatch for each pattern"""
+        import fnmatch
+        from sftp_ops import compile_fnmatch_patterns
+        patterns = ['*.sample.*', '/media/tmp/*', 'trailer?.mkv']
+        regex = compile_fnmatch_patterns(patterns)
+        for name in ['a.sample.mkv', '/media/tmp/x/y.mkv', 'trailer1.mkv',
+                     'trailer10.mkv', 'movie.mkv', '/media/movies/a.mkv']:
+            expected = any(fnmatch.fnmatch(name, p) for p in patterns)
+            assert bool(regex.match(name)) is expected, name
+        assert compile_fnmatch_patterns([]) is None
+
+    def test_list_videos_applies_filters(self):
+        """Test extension, hidden-file and exclude filters on a remote tree"""
+        import stat
+        from sftp_ops import sftp_list_videos
+        tree = {
+            '/media': [self._attr('movie.MKV', stat.S_IFREG), self._attr('notes.txt', stat.S_IFREG),
+                       self._attr('.hidden.mkv', stat.S_IFREG), self._attr('extras', stat.S_IFDIR)],
+            '/media/extras': [self._attr('clip.sample.mkv', stat.S_IFREG),
+                              self._attr('bonus.mp4', stat.S_IFREG)],
+        }
+        conn = MagicMock()
+        conn.sftp.listdir_attr.side_effect = lambda d: tree[d]
+
+        videos = sftp_list_videos(conn, ['/media'], ['mkv', 'mp4'], ['*.sample.*'])
+
+        assert videos == ['/media/movie.MKV', '/media/extras/bonus.mp4']
+
+    def test_list_videos_fills_stats(self):
+        """Test listed files get size and mtime from the listing attributes"""
+        import stat
+        from sftp_ops import sftp_list_videos
+        movie = self._attr('movie.mkv', stat.S_IFREG)
+        movie.st_size = 1024
+        movie.st_mtime = 1000
+        conn = MagicMock()
+        conn.sftp.listdir_attr.return_value = [movie, self._attr('notes.txt', stat.S_IFREG)]
+
+        stats = {}
+        videos = sftp_list_videos(conn, ['/media'], ['mkv'], None, stats)
+
+        assert videos == ['/media/movie.mkv']
+        assert stats == {'/media/movie.mkv': (1024, 1000)}
+
     def test_multiple_allowed_dirs(self):
         """Test path in second allowed dir is accepted"""
         from sftp_ops import validate_remote_path
@@ -1916,6 +2920,64 @@ class TestRemotePathValidation:
         from sftp_ops import validate_remote_path
         assert validate_remote_path('/media2/file.mp4', ['/media']) is False
 
+    def test_connect_sizes_window_for_max_requests(self):
+        """Test the SFTP channel window covers max_requests outstanding reads"""
+        from sftp_ops import SFTPConnection, SFTP_REQUEST_SIZE
+        conn = SFTPConnection('nas01', 'root', max_requests=512)
+        with patch('paramiko.SSHClient'):
+            with patch('paramiko.SFTPClient.from_transport') as mock_sftp:
+                conn.connect()
+
+        assert mock_sftp.call_args[1]['window_size'] == 512 * SFTP_REQUEST_SIZE
+
+    def test_sftp_max_requests_default_matches(self):
+        """Test config validation and SFTPConnection use the same default"""
+        import sftp_ops
+        import video_converter_daemon
+        assert (video_converter_daemon.SFTP_MAX_REQUESTS_DEFAULT
+                == sftp_ops.SFTP_MAX_REQUESTS_DEFAULT)
+
+    def test_channel_timeout_set_on_connect(self):
+        """Test the transfer timeout is set once per connection, not per call"""
+        from sftp_ops import SFTPConnection, sftp_download
+        conn = SFTPConnection('nas01', 'root', channel_timeout=600)
+        with patch('paramiko.SSHClient'):
+            with patch('paramiko.SFTPClient.from_transport') as mock_sftp:
+                conn.connect()
+                channel = mock_sftp.return_value.get_channel.return_value
+                channel.settimeout.assert_called_once_with(600.0)
+
+                sftp_download(conn, '/media/a.mkv', '/tmp/a.mkv')
+                channel.settimeout.assert_called_once()
+
+    def test_download_limits_prefetch_requests(self):
+        """Test downloads keep at most max_requests reads in flight"""
+        from sftp_ops import sftp_download
+        conn = MagicMock()
+        conn.max_requests = 128
+
+        sftp_download(conn, '/media/a.mkv', '/tmp/a.mkv')
+
+        conn.sftp.get.assert_called_once_with(
+            '/media/a.mkv', '/tmp/a.mkv', max_concurrent_prefetch_requests=128
+        )
+
+    def test_connection_pool_reuses_and_bounds(self):
+        """Test the pool opens at most size connections and reuses idle ones"""
+        from sftp_ops import SFTPConnectionPool
+        pool = SFTPConnectionPool(2, host='nas01', user='root')
+
+        with pool.acquire() as first:
+            with pool.acquire() as second:
+                assert first is not second
+        with pool.acquire() as again:
+            assert again is first  # most recently returned is reused
+
+        assert len(pool._all) == 2
+        with patch('sftp_ops.SFTPConnection.disconnect') as mock_disconnect:
+            pool.close()
+        assert mock_disconnect.call_count == 2
+
 
 class TestRemoteDiscovery:
     """Test remote video discovery with mocked SFTP"""
@@ -1989,35 +3051,47 @@ class TestRemoteShouldProcess:
         file_hash = remote_daemon.get_file_hash(video)
         remote_daemon.processed_files.add(file_hash)
 
-        assert remote_daemon.should_process(video) is False
+        assert remote_daemon.should_process(video) is None
 
     def test_m4v_skipped(self, remote_daemon):
         """Test .m4v files are skipped"""
-        assert remote_daemon.should_process('/media/already.m4v') is False
+        with patch('sftp_ops.sftp_exists') as mock_exists:
+            assert remote_daemon.should_process('/media/already.m4v') is None
+        mock_exists.assert_not_called()
 
     def test_output_exists_skipped(self, remote_daemon):
         """Test file with existing output on remote is skipped"""
         with patch('sftp_ops.sftp_exists', return_value=True):
             with patch('sftp_ops.sftp_stat', return_value=(1024, 1000.0)):
-                assert remote_daemon.should_process('/media/film.mkv') is False
+                assert remote_daemon.should_process('/media/film.mkv') is None
 
     def test_oversized_file_skipped(self, remote_daemon):
         """Test oversized remote file is skipped"""
         with patch('sftp_ops.sftp_exists', return_value=False):
             with patch('sftp_ops.sftp_stat', return_value=(200 * 1024**3, 1000.0)):
-                assert remote_daemon.should_process('/media/huge.mkv') is False
+                assert remote_daemon.should_process('/media/huge.mkv') is None
 
     def test_empty_file_skipped(self, remote_daemon):
         """Test empty remote file is skipped"""
         with patch('sftp_ops.sftp_exists', return_value=False):
             with patch('sftp_ops.sftp_stat', return_value=(0, 1000.0)):
-                assert remote_daemon.should_process('/media/empty.mkv') is False
+                assert remote_daemon.should_process('/media/empty.mkv') is None
 
     def test_valid_file_accepted(self, remote_daemon):
         """Test valid remote file passes should_process"""
         with patch('sftp_ops.sftp_exists', return_value=False):
             with patch('sftp_ops.sftp_stat', return_value=(1024 * 1024, 1000.0)):
-                assert remote_daemon.should_process('/media/good.mkv') is True
+                assert remote_daemon.should_process('/media/good.mkv') is not None
+
+    def test_listed_stat_reused(self, remote_daemon):
+        """Test size and mtime from discovery are used without an SFTP stat"""
+        remote_daemon._remote_stats = {'/media/good.mkv': (2048, 1234.0)}
+        with patch('sftp_ops.sftp_exists', return_value=False):
+            with patch('sftp_ops.sftp_stat') as mock_stat:
+                result = remote_daemon.should_process('/media/good.mkv')
+
+        assert result == (2048, 1234.0)
+        mock_stat.assert_not_called()
 
 
 class TestRemoteConversion:
@@ -2033,25 +3107,39 @@ class TestRemoteConversion:
             daemon = VideoConverterDaemon(config_file)
 
         daemon._sftp_conn = MagicMock()
+        daemon._sftp_pool = MagicMock()
+        daemon._sftp_pool.acquire.return_value.__enter__.return_value = daemon._sftp_conn
         return daemon
 
+    def test_init_remote_always_pools_transfers(self, tmp_path):
+        """Test transfers get a pool of max_workers connections with the transfer timeout"""
+        config = _make_remote_config(tmp_path)
+        config_file = _write_config(tmp_path, config)
+        with patch('sftp_ops.SFTPConnection'):
+            with patch('sftp_ops.SFTPConnectionPool') as mock_pool:
+                VideoConverterDaemon(config_file)
+
+        args, kwargs = mock_pool.call_args
+        assert args == (config['daemon']['max_workers'],)
+        assert kwargs['channel_timeout'] == 3600
+
     def test_remote_conversion_happy_path(self, remote_daemon, tmp_path):
         """Test successful remote conversion: download, convert, upload"""
         work_dir = Path(remote_daemon.config['processing']['work_dir'])
         video_path = '/media/movies/film.mkv'
         file_hash = remote_daemon.get_file_hash(video_path)
 
-        def fake_download(conn, remote, local, timeout):
+        def fake_download(conn, remote, local):
             Path(local).write_bytes(b"video data")
 
         def fake_ffmpeg(*args, **kwargs):
-            output_file = work_dir / f"{file_hash}_output.m4v"
+            output_file = work_dir / f"{file_hash:016x}_output.m4v"
             output_file.write_bytes(b"converted data")
-            return MagicMock(returncode=0)
+            return 0, ''
 
         with patch('sftp_ops.sftp_download', side_effect=fake_download):
             with patch('sftp_ops.validate_remote_path', return_value=True):
-                with patch('subprocess.run', side_effect=fake_ffmpeg):
+                with patch.object(remote_daemon, '_run_ffmpeg', side_effect=fake_ffmpeg):
                     with patch('sftp_ops.sftp_upload') as mock_upload:
                         with patch('sftp_ops.sftp_stat', return_value=(1024, 1000.0)):
                             with patch('sftp_ops.sftp_utime'):
@@ -2061,6 +3149,52 @@ class TestRemoteConversion:
                                 mock_upload.assert_called_once()
                                 assert file_hash in remote_daemon.processed_files
 
+    def test_remote_pipeline_overlaps_transfers(self, remote_daemon):
+        """Test remote mode runs extra workers but at most max_workers encodes"""
+        max_workers = remote_daemon.config['daemon']['max_workers']
+        executor = remote_daemon._get_executor()
+        try:
+            assert executor._max_workers == max_workers * 2
+        finally:
+            executor.shutdown(wait=True)
+
+        work_dir = Path(remote_daemon.config['processing']['work_dir'])
+        video_path = '/media/movies/film.mkv'
+        file_hash = remote_daemon.get_file_hash(video_path)
+        slots_free = []
+
+        def fake_ffmpeg(*args, **kwargs):
+            slots_free.append(remote_daemon._encode_slots._value)
+            (work_dir / f"{file_hash:016x}_output.m4v").write_bytes(b"converted")
+            return 0, ''
+
+        with patch('sftp_ops.sftp_download'):
+            with patch('sftp_ops.validate_remote_path', return_value=True):
+                with patch.object(remote_daemon, '_run_ffmpeg', side_effect=fake_ffmpeg):
+                    with patch('sftp_ops.sftp_upload'):
+                        with patch('sftp_ops.sftp_utime'):
+                            assert remote_daemon.convert_video(video_path, file_hash, (1, 0.0))
+
+        assert slots_free == [max_workers - 1]
+        assert remote_daemon._encode_slots._value == max_workers
+        # Download and upload each check out their own connection
+        assert remote_daemon._sftp_pool.acquire.call_count == 2
+
+    def test_remote_transfers_use_pooled_connection(self, remote_daemon):
+        """Test downloads check a connection out of the transfer pool"""
+        from sftp_ops import SFTPOperationError
+        pooled = MagicMock()
+        remote_daemon._sftp_pool = MagicMock()
+        remote_daemon._sftp_pool.acquire.return_value.__enter__.return_value = pooled
+
+        with patch('sftp_ops.validate_remote_path', return_value=True):
+            with patch('sftp_ops.sftp_download',
+                       side_effect=SFTPOperationError("stop")) as mock_dl:
+                assert remote_daemon.convert_video('/media/movies/film.mkv') is False
+
+        assert mock_dl.call_args[0][0] is pooled
+        remote_daemon._sftp_pool.acquire.return_value.__exit__.assert_called_once()
+
     def test_remote_conversion_download_fails(self, remote_daemon):
         """Test remote conversion handles download failure"""
         from sftp_ops import SFTPOperationError
@@ -2074,13 +3208,13 @@ class TestRemoteConversion:
 
     def test_remote_conversion_ffmpeg_fails(self, remote_daemon, tmp_path):
         """Test remote conversion handles FFmpeg failure"""
-        def fake_download(conn, remote, local, timeout):
+        def fake_download(conn, remote, local):
             Path(local).write_bytes(b"video data")
 
         with patch('sftp_ops.validate_remote_path', return_value=True):
             with patch('sftp_ops.sftp_download', side_effect=fake_download):
-                with patch('subprocess.run') as mock_run:
-                    mock_run.return_value = MagicMock(returncode=1, stderr="FFmpeg error")
+                with patch.object(remote_daemon, '_run_ffmpeg') as mock_run:
+                    mock_run.return_value = (1, "FFmpeg error")
 
                     result = remote_daemon.convert_video('/media/movies/film.mkv')
                     assert result is False
@@ -2092,17 +3226,17 @@ class TestRemoteConversion:
         video_path = '/media/movies/film.mkv'
         file_hash = remote_daemon.get_file_hash(video_path)
 
-        def fake_download(conn, remote, local, timeout):
+        def fake_download(conn, remote, local):
             Path(local).write_bytes(b"video data")
 
         def fake_ffmpeg(*args, **kwargs):
-            output_file = work_dir / f"{file_hash}_output.m4v"
+            output_file = work_dir / f"{file_hash:016x}_output.m4v"
             output_file.write_bytes(b"converted data")
-            return MagicMock(returncode=0)
+            return 0, ''
 
         with patch('sftp_ops.validate_remote_path', return_value=True):
             with patch('sftp_ops.sftp_download', side_effect=fake_download):
-                with patch('subprocess.run', side_effect=fake_ffmpeg):
+                with patch.object(remote_daemon, '_run_ffmpeg', side_effect=fake_ffmpeg):
                     with patch('sftp_ops.sftp_upload') as mock_upload:
                         mock_upload.side_effect = SFTPOperationError("Upload failed")
 
@@ -2110,11 +3244,60 @@ class TestRemoteConversion:
                         assert result is False
 
                         # Verify temp files cleaned up
-                        local_input = work_dir / f"{file_hash}_input.mkv"
-                        local_output = work_dir / f"{file_hash}_output.m4v"
+                        local_input = work_dir / f"{file_hash:016x}_input.mkv"
+                        local_output = work_dir / f"{file_hash:016x}_output.m4v"
                         assert not local_input.exists()
                         assert not local_output.exists()
 
+    def test_remote_originals_deleted_once_per_batch(self, remote_daemon):
+        """Test remote originals are queued and deleted in one batch"""
+        remote_daemon.config['processing']['keep_original'] = False
+        remote_daemon._bind_config()
+        videos = ['/media/movies/a.mkv', '/media/movies/b.mkv']
+
+        def fake_convert(video_path, file_hash=None, source_stat=None):
+            with remote_daemon._pending_deletes_lock:
+                remote_daemon._pending_deletes.append(video_path)
+            return True
+
+        with patch.object(remote_daemon, 'should_process', return_value=(1024, 0.0)):
+            with patch.object(remote_daemon, 'convert_video', side_effect=fake_convert):
+                with patch('sftp_ops.sftp_delete_many', return_value=[]) as mock_delete:
+                    remote_daemon.process_batch(videos)
+
+        mock_delete.assert_called_once()
+        assert sorted(mock_delete.call_args[0][1]) == videos
+        assert remote_daemon._pending_deletes == []
+
+    def test_failed_remote_deletes_are_retried(self, remote_daemon):
+        """Test originals whose delete raised or failed are queued for the next flush"""
+        from sftp_ops import SFTPConnectionError
+        videos = ['/media/movies/a.mkv', '/media/movies/b.mkv']
+        remote_daemon._pending_deletes = list(videos)
+
+        with patch('sftp_ops.sftp_delete_many',
+                   side_effect=SFTPConnectionError("unreachable")):
+            remote_daemon._flush_pending_deletes()
+        assert remote_daemon._pending_deletes == videos
+
+        with patch('sftp_ops.sftp_delete_many', return_value=[videos[1]]) as mock_delete:
+            remote_daemon._flush_pending_deletes()
+        assert mock_delete.call_args[0][1] == videos
+        assert remote_daemon._pending_deletes == [videos[1]]
+
+    def test_sftp_delete_many_continues_after_failure(self):
+        """Test one failed remove does not stop the remaining deletes"""
+        from sftp_ops import sftp_delete_many
+
+        conn = MagicMock()
+        conn.sftp.remove.side_effect = [IOError("denied"), None, FileNotFoundError()]
+
+        failed = sftp_delete_many(conn, ['/media/a.mkv', '/media/b.mkv', '/media/c.mkv'])
+
+        assert failed == ['/media/a.mkv']
+        assert conn.sftp.remove.call_count == 3
+        conn.ensure_connected.assert_called_once()
+
     def test_remote_conversion_path_validation_fails(self, remote_daemon):
         """Test remote conversion rejects invalid paths"""
         with patch('sftp_ops.validate_remote_path', return_value=False):
@@ -2198,7 +3381,7 @@ class TestLocalModeUnchanged:
         video = tmp_path / "test.mp4"
         video.write_bytes(b"data")
 
-        assert local_daemon.should_process(video) is True
+        assert local_daemon.should_process(video) is not None
 
     def test_local_dry_run_conversion(self, tmp_path):
         """Test local dry-run conversion still works"""
@@ -2246,3 +3429,221 @@ class TestLocalModeUnchanged:
 
         result = daemon.convert_video(video)
         assert result is True
+
+
+class TestDirectoryWatch:
+    """Test inotify-based watching of new files"""
+
+    @pytest.fixture
+    def daemon_instance(self, tmp_path):
+        """Create a daemon instance with watch enabled"""
+        work_dir = tmp_path / "work"
+        work_dir.mkdir()
+        state_dir = tmp_path / "state"
+        state_dir.mkdir()
+        log_dir = tmp_path / "logs"
+        log_dir.mkdir()
+        log_file = log_dir / "daemon.log"
+        videos_dir = tmp_path / "videos"
+        videos_dir.mkdir()
+
+        config = {
+            'directories': [str(videos_dir)],
+            'conversion': {
+                'codec': 'libx264',
+                'crf': 23,
+                'preset': 'medium',
+                'audio_codec': 'aac',
+                'audio_bitrate': '128k',
+                'extra_options': [],
+            },
+            'processing': {
+                'work_dir': str(work_dir),
+                'state_dir': str(state_dir),
+                'include_extensions': ['mp4'],
+                'exclude_patterns': ['*.sample.mp4'],
+                'keep_original': True,
+            },
+            'daemon': {
+                'log_level': 'INFO',
+                'log_file': str(log_file),
+                'scan_interval': 300,
+                'max_workers': 2,
+                'watch': True,
+            },
+        }
+
+        config_file = tmp_path / "config.yaml"
+        import yaml
+        with open(config_file, 'w') as f:
+            yaml.dump(config, f)
+
+        return VideoConverterDaemon(str(config_file))
+
+    def test_invalid_watch_rejected(self, daemon_instance):
+        """Test a non-boolean watch setting is rejected"""
+        daemon_instance.config['daemon']['watch'] = 'yes'
+        with pytest.raises(ConfigValidationError, match="watch"):
+            daemon_instance.validate_config()
+
+    def test_watcher_reports_closed_and_moved_files(self, tmp_path):
+        """Test files are reported once written or moved in, including in new subdirectories"""
+        from fs_watch import InotifyWatcher
+        root = tmp_path / "root"
+        root.mkdir()
+        watcher = InotifyWatcher([str(root)])
+        watcher.start()
+        try:
+            (root / "a.mp4").write_bytes(b"data")
+            staged = tmp_path / "b.mp4"
+            staged.write_bytes(b"data")
+            os.rename(staged, root / "b.mp4")
+            sub = root / "season1"
+            sub.mkdir()
+
+            paths = set()
+            for _ in range(5):
+                paths |= watcher.read(0.5)
+                if watcher.watch_count == 2:
+                    break
+            (sub / "c.mp4").write_bytes(b"data")
+            for _ in range(5):
+                paths |= watcher.read(0.5)
+                if str(sub / "c.mp4") in paths:
+                    break
+
+            assert str(root / "a.mp4") in paths
+            assert str(root / "b.mp4") in paths
+            assert str(sub / "c.mp4") in paths
+            assert watcher.watch_count == 2
+            assert not watcher.overflowed
+        finally:
+            watcher.close()
+
+    def test_watcher_skips_open_files_in_new_directory(self, tmp_path):
+        """Test files already in a directory moved in are only reported once closed"""
+        from fs_watch import InotifyWatcher
+        root = tmp_path / "root"
+        root.mkdir()
+        staged = tmp_path / "show"
+        staged.mkdir()
+        watcher = InotifyWatcher([str(root)])
+        watcher.start()
+        try:
+            with open(staged / "big.mp4", 'wb') as f:
+                f.write(b"partial")
+                f.flush()
+                os.rename(staged, root / "show")
+                paths = set()
+                for _ in range(5):
+                    paths |= watcher.read(0.5)
+                    if watcher.watch_count == 2:
+                        break
+                assert watcher.watch_count == 2
+                assert paths == set()
+                f.write(b"rest")
+
+            video = str(root / "show" / "big.mp4")
+            for _ in range(5):
+                paths |= watcher.read(0.5)
+                if video in paths:
+                    break
+            assert paths == {video}
+        finally:
+            watcher.close()
+
+    def test_watcher_reads_with_high_fd(self, tmp_path):
+        """Test events are read when the inotify fd is above select()'s FD_SETSIZE"""
+        import resource
+        from fs_watch import InotifyWatcher
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard != resource.RLIM_INFINITY and hard < 1200:
+            pytest.skip("RLIMIT_NOFILE too low")
+        resource.setrlimit(resource.RLIMIT_NOFILE, (max(soft, 1200), hard))
+        filler = []
+        watcher = InotifyWatcher([str(tmp_path)])
+        try:
+            while len(filler) < 1100:
+                filler.append(os.open(os.devnull, os.O_RDONLY))
+            watcher.start()
+            assert watcher._fd >= 1024
+
+            (tmp_path / "a.mp4").write_bytes(b"data")
+            assert watcher.read(5) == {str(tmp_path / "a.mp4")}
+        finally:
+            watcher.close()
+            for fd in filler:
+                os.close(fd)
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+    def test_watcher_wake_interrupts_read(self, tmp_path):
+        """Test wake() makes a blocked read() return immediately"""
+        import time
+        from fs_watch import InotifyWatcher
+        watcher = InotifyWatcher([str(tmp_path)])
+        watcher.start()
+        try:
+            watcher.wake()
+            start = time.monotonic()
+            assert watcher.read(10) == set()
+            assert time.monotonic() - start < 5
+        finally:
+            watcher.close()
+
+    def test_filter_watched_paths(self, daemon_instance, tmp_path):
+        """Test watched paths get the same filters as discovery"""
+        videos_dir = tmp_path / "videos"
+        keep = videos_dir / "movie.mp4"
+        keep.write_bytes(b"data")
+        (videos_dir / "notes.txt").write_bytes(b"data")
+        (videos_dir / "clip.sample.mp4").write_bytes(b"data")
+        outside = tmp_path / "outside.mp4"
+        outside.write_bytes(b"data")
+        (videos_dir / "link.mp4").symlink_to(outside)
+
+        paths = {str(p) for p in videos_dir.iterdir()} | {str(videos_dir / "gone.mp4")}
+        assert daemon_instance._filter_watched_paths(paths) == [keep]
+
+    def test_watch_until_processes_reported_files(self, daemon_instance, tmp_path):
+        """Test files reported between scans are converted without a full scan"""
+        video = tmp_path / "videos" / "movie.mp4"
+        video.write_bytes(b"data")
+        watcher = MagicMock()
+        watcher.overflowed = False
+
+        def read(timeout):
+            if watcher.read.call_count == 1:
+                return {str(video)}
+            daemon_instance.running = False
+            return set()
+
+        watcher.read.side_effect = read
+        daemon_instance._watcher = watcher
+        with patch.object(daemon_instance, 'process_batch') as mock_batch:
+            with patch.object(daemon_instance, 'discover_videos') as mock_discover:
+                daemon_instance._watch_until(float('inf'))
+
+        mock_batch.assert_called_once_with([video])
+        mock_discover.assert_not_called()
+
+    def test_watch_overflow_forces_rescan(self, daemon_instance):
+        """Test lost events rebuild the watcher and drop the discovery cache"""
+        watcher = MagicMock()
+        watcher.overflowed = True
+        watcher.read.return_value = set()
+        daemon_instance._watcher = watcher
+        daemon_instance._discovery_cache = [Path("/cached.mp4")]
+        replacement = MagicMock()
+
+        with patch.object(daemon_instance, '_start_watcher', return_value=replacement):
+            daemon_instance._watch_until(float('inf'))
+
+        watcher.close.assert_called_once()
+        assert daemon_instance._watcher is replacement
+        assert daemon_instance._discovery_cache == []
+
+    def test_watch_unavailable_falls_back_to_polling(self, daemon_instance):
+        """Test the daemon keeps polling when inotify cannot be used"""
+        from fs_watch import WatchError
+        with patch('fs_watch.InotifyWatcher.start', side_effect=WatchError("limit reached")):
+            assert daemon_instance._start_watcher() is None
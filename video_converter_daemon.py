@@ -6,29 +6,41 @@ Supports local mode (default) and remote mode via SSH/SFTP
 """
 
 import os
+import errno
 import sys
 import time
 import yaml
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import queue
+import atexit
 import subprocess
 import hashlib
 import shutil
 import re
+import collections
 import threading
 import argparse
 import posixpath
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Set, Optional, Union
+from typing import Iterable, List, Dict, Set, Optional, Pattern, Tuple, Union
 import signal
 import json
+import itertools
+
+try:
+    # libyaml's C parser; PyYAML falls back to pure Python without it
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
 
 # --- Security: Allowed values for config validation ---
 ALLOWED_CODECS = frozenset([
     'libx264', 'libx265', 'libvpx', 'libvpx-vp9', 'libaom-av1',
-    'copy', 'mpeg4', 'h264_nvenc', 'hevc_nvenc', 'h264_vaapi',
+    'copy', 'mpeg4', 'h264_nvenc', 'hevc_nvenc', 'h264_vaapi', 'hevc_vaapi',
+    'h264_qsv', 'hevc_qsv',
 ])
 ALLOWED_AUDIO_CODECS = frozenset([
     'aac', 'libmp3lame', 'libvorbis', 'libopus', 'copy', 'ac3', 'flac',
@@ -42,20 +54,132 @@ ALLOWED_EXTENSIONS = frozenset([
     'avi', 'mkv', 'mov', 'mp4', 'flv', 'wmv', 'mpg', 'mpeg', 'm4v',
     'webm', 'ts', 'vob', 'ogv', '3gp', 'divx',
 ])
+# Hardware encode backends selectable via conversion.hwaccel
+ALLOWED_HWACCEL = frozenset(['none', 'auto', 'cuda', 'vaapi', 'qsv'])
+# Hardware encoder used for each codec, per hwaccel backend
+HW_ENCODERS = {
+    'cuda': {
+        'libx264': 'h264_nvenc', 'h264_nvenc': 'h264_nvenc',
+        'libx265': 'hevc_nvenc', 'hevc_nvenc': 'hevc_nvenc',
+    },
+    'vaapi': {
+        'libx264': 'h264_vaapi', 'h264_vaapi': 'h264_vaapi',
+        'libx265': 'hevc_vaapi', 'hevc_vaapi': 'hevc_vaapi',
+    },
+    'qsv': {
+        'libx264': 'h264_qsv', 'h264_qsv': 'h264_qsv',
+        'libx265': 'hevc_qsv', 'hevc_qsv': 'hevc_qsv',
+    },
+}
+# x264/x265 preset -> NVENC preset (p1 fastest .. p7 best quality)
+NVENC_PRESETS = {
+    'ultrafast': 'p1', 'superfast': 'p1', 'veryfast': 'p2', 'faster': 'p3',
+    'fast': 'p3', 'medium': 'p4', 'slow': 'p5', 'slower': 'p6', 'veryslow': 'p7',
+}
+# x264/x265 preset -> QSV preset (QSV has no ultrafast/superfast)
+QSV_PRESETS = {
+    'ultrafast': 'veryfast', 'superfast': 'veryfast', 'veryfast': 'veryfast',
+    'faster': 'faster', 'fast': 'fast', 'medium': 'medium', 'slow': 'slow',
+    'slower': 'slower', 'veryslow': 'veryslow',
+}
+# Backends tried, in order, by hwaccel "auto". QSV and VAAPI share the
+# render node, so QSV goes first: it only passes the test encode on Intel,
+# and VAAPI covers the rest.
+HWACCEL_AUTO_ORDER = ('cuda', 'qsv', 'vaapi')
+# Codecs hwaccel "auto" can map onto every backend (libx264/libx265)
+HWACCEL_AUTO_CODECS = frozenset.intersection(
+    *(frozenset(HW_ENCODERS[b]) for b in HWACCEL_AUTO_ORDER)
+)
+# Device node present when the NVIDIA driver is loaded
+NVIDIA_CONTROL_DEVICE = '/dev/nvidiactl'
+# Software encoder used when the configured hardware encoder is unavailable
+SOFTWARE_ENCODERS = {
+    'h264_nvenc': 'libx264', 'hevc_nvenc': 'libx265',
+    'h264_vaapi': 'libx264', 'hevc_vaapi': 'libx265',
+    'h264_qsv': 'libx264', 'hevc_qsv': 'libx265',
+}
+# Regex: VAAPI device must be a DRM render node
+VAAPI_DEVICE_RE = re.compile(r'^/dev/dri/renderD12[0-9]$')
+DEFAULT_VAAPI_DEVICE = '/dev/dri/renderD128'
+# ffprobe codec_name produced by each allowed video / audio codec, used to
+# decide whether a source stream can be copied (conversion.remux_when_possible)
+VIDEO_CODEC_STREAM_NAMES = {
+    'libx264': 'h264', 'h264_nvenc': 'h264', 'h264_vaapi': 'h264', 'h264_qsv': 'h264',
+    'libx265': 'hevc', 'hevc_nvenc': 'hevc', 'hevc_vaapi': 'hevc', 'hevc_qsv': 'hevc',
+    'libvpx': 'vp8', 'libvpx-vp9': 'vp9', 'libaom-av1': 'av1', 'mpeg4': 'mpeg4',
+}
+AUDIO_CODEC_STREAM_NAMES = {
+    'aac': 'aac', 'libmp3lame': 'mp3', 'libvorbis': 'vorbis', 'libopus': 'opus',
+    'ac3': 'ac3', 'flac': 'flac',
+}
+# Timeout for the one-off `ffmpeg -encoders` probe and hwaccel "auto"
+# test encodes (seconds)
+FFMPEG_PROBE_TIMEOUT = 30
+# Source file stat handed from should_process to convert_video:
+# os.stat_result locally, (size, mtime) from SFTP in remote mode
+SourceStat = Union[os.stat_result, Tuple[int, float]]
+# Processed-file keys are lowercase hex: 16-hex path fingerprints, 32-hex
+# BLAKE2b hashes (same fingerprint, longer form) or 64-hex SHA-256 hashes
+# written by earlier versions (migrated lazily)
+PROCESSED_KEY_LENGTHS = frozenset([16, 32, 64])
+HEX_DIGITS = frozenset('0123456789abcdef')
+LEGACY_HASH_LEN = 64
+# Hex digits of a path fingerprint as stored in processed.json / .jsonl
+FINGERPRINT_HEX_LEN = 16
+# Processed-file key: int fingerprint, or raw legacy SHA-256 digest
+ProcessedKey = Union[int, bytes]
+# Flushes file data (and the size, but not timestamps) to disk for the
+# processed journal and snapshot; plain fsync where fdatasync is missing
+_fdatasync = getattr(os, 'fdatasync', os.fsync)
 # Regex: audio bitrate must be digits followed by 'k' or 'M'
 AUDIO_BITRATE_RE = re.compile(r'^\d{1,4}[kM]$')
 # Max concurrent workers to prevent resource exhaustion
 MAX_WORKERS_LIMIT = 8
 # Max conversion timeout: 24 hours (prevents zombie processes)
 MAX_CONVERSION_TIMEOUT = 86400
+# Bytes of ffmpeg stderr kept for the log when a conversion fails
+FFMPEG_STDERR_TAIL_BYTES = 2000
+# ffmpeg stderr is drained in chunks of this size into a 2-chunk ring buffer
+FFMPEG_STDERR_CHUNK_BYTES = 4096
+# Default seconds an encode may go without progress before it is killed
+FFMPEG_STALL_TIMEOUT_DEFAULT = 600
+# Seconds between checks of a running ffmpeg's progress
+FFMPEG_WATCHDOG_INTERVAL = 10
+# -progress keys whose change means ffmpeg is still producing output
+FFMPEG_PROGRESS_KEYS = frozenset([b'out_time_us', b'total_size'])
+# Regex: temp files convert_video creates in work_dir (<hash>_input.<ext> /
+# <hash>_output.m4v), including hash widths written by earlier versions
+WORK_TEMP_FILE_RE = re.compile(
+    r'^(?:[a-f0-9]{16}|[a-f0-9]{32}|[a-f0-9]{64})_(?:input\.[A-Za-z0-9]+|output\.m4v)$'
+)
 # Max file size for conversion: 100 GB
 MAX_FILE_SIZE_BYTES = 100 * 1024 * 1024 * 1024
 # Minimum free disk space limits (in GB)
 MIN_FREE_SPACE_GB_DEFAULT = 10
 MIN_FREE_SPACE_GB_MIN = 1
 MIN_FREE_SPACE_GB_MAX = 100
+# Journal appends between compactions of processed.jsonl into processed.json
+JOURNAL_COMPACT_EVERY = 1000
+# Maximum threads walking configured directories concurrently
+MAX_DISCOVERY_THREADS = 8
+# Bounds for remote.sftp_max_requests (32 KB reads in flight per download;
+# 4096 is a 128 MB channel window)
+SFTP_MAX_REQUESTS_MIN = 16
+SFTP_MAX_REQUESTS_MAX = 4096
+# Default remote.sftp_max_requests; same as sftp_ops.SFTP_MAX_REQUESTS_DEFAULT,
+# repeated here so config validation does not need paramiko
+SFTP_MAX_REQUESTS_DEFAULT = 256
+# Remote mode: files in flight per encode slot, so the next download and
+# the previous upload overlap each running ffmpeg
+REMOTE_PIPELINE_DEPTH = 2
 # Maximum files to discover per scan to prevent memory exhaustion
 MAX_DISCOVERED_FILES = 10000
+# Directories modified this recently (ns) are rescanned instead of cached,
+# covering filesystems with coarse mtime granularity
+DIR_CACHE_RACY_NS = 2 * 1000 * 1000 * 1000
+# Bumped when discovery rules change so older cached listings are discarded
+# (2: symlinked files are no longer listed)
+DIR_CACHE_FORMAT = 2
 
 # FHS-compliant default paths
 DEFAULT_CONFIG_PATH = '/etc/video-converter/config.yaml'
@@ -63,12 +187,123 @@ DEFAULT_STATE_DIR = '/var/lib/video-converter'
 DEFAULT_LOG_DIR = '/var/log/video-converter'
 VERSION = '2.0.0'
 
+# --- Declarative config schema, checked by validate_config ---
+# (section, key, default, allowed values)
+CONFIG_ALLOWLIST_FIELDS = (
+    ('conversion', 'codec', '', ALLOWED_CODECS),
+    ('conversion', 'hwaccel', 'none', ALLOWED_HWACCEL),
+    ('conversion', 'audio_codec', '', ALLOWED_AUDIO_CODECS),
+    ('conversion', 'preset', '', ALLOWED_PRESETS),
+    ('daemon', 'log_level', 'INFO', ALLOWED_LOG_LEVELS),
+)
+# (section, key, default, accepted types, minimum, maximum or None, hint)
+CONFIG_RANGE_FIELDS = (
+    ('conversion', 'crf', 23, int, 0, 51, "Must be integer 0-51."),
+    ('conversion', 'stall_timeout', FFMPEG_STALL_TIMEOUT_DEFAULT, (int, float), 60,
+     MAX_CONVERSION_TIMEOUT, f"Must be 60-{MAX_CONVERSION_TIMEOUT} seconds."),
+    ('daemon', 'max_workers', 2, int, 1, MAX_WORKERS_LIMIT,
+     f"Must be 1-{MAX_WORKERS_LIMIT}."),
+    # At least 30 seconds to prevent busy-loop
+    ('daemon', 'scan_interval', 300, (int, float), 30, None, "Must be >= 30 seconds."),
+    ('processing', 'min_free_space_gb', MIN_FREE_SPACE_GB_DEFAULT, (int, float),
+     MIN_FREE_SPACE_GB_MIN, MIN_FREE_SPACE_GB_MAX,
+     f"Must be {MIN_FREE_SPACE_GB_MIN}-{MIN_FREE_SPACE_GB_MAX}."),
+)
+# (section, key, default) of settings that must be absolute paths
+CONFIG_ABSOLUTE_PATH_FIELDS = (
+    ('processing', 'work_dir', ''),
+    ('processing', 'state_dir', DEFAULT_STATE_DIR),
+    ('daemon', 'log_file', ''),
+)
+
 
 class ConfigValidationError(Exception):
     """Raised when configuration values fail validation."""
     pass
 
 
+def _glob_component_to_regex(component: str) -> str:
+    """Translate one path component of a glob to a regex fragment.
+
+    Same rules as fnmatch, except wildcards never match '/'.
+    """
+    out = []
+    i, n = 0, len(component)
+    while i < n:
+        c = component[i]
+        i += 1
+        if c == '*':
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = i
+            if j < n and component[j] == '!':
+                j += 1
+            if j < n and component[j] == ']':
+                j += 1
+            while j < n and component[j] != ']':
+                j += 1
+            if j >= n:
+                out.append('\\[')
+            else:
+                body = component[i:j].replace('\\', '\\\\')
+                i = j + 1
+                if body.startswith('!'):
+                    body = '^/' + body[1:]
+                elif body.startswith('^'):
+                    body = '\\' + body
+                out.append(f'[{body}]')
+        else:
+            out.append(re.escape(c))
+    return ''.join(out)
+
+
+def compile_exclude_patterns(patterns: List[str]) -> Optional[Pattern]:
+    """Compile exclude globs into one regex with Path.match() semantics.
+
+    A relative pattern matches the trailing components of a path (so
+    '*.converted.*' tests the file name and '*/.backup/*' the parent and
+    name); an absolute pattern must match the whole path. Searching the
+    combined regex once per file replaces a Path.match() call per pattern.
+
+    Returns:
+        Compiled regex, or None if there are no patterns.
+    """
+    alternatives = []
+    for pattern in patterns:
+        if not pattern:
+            continue
+        parts = PurePosixPath(pattern).parts
+        if parts[0] == '/':
+            body = '/' + '/'.join(_glob_component_to_regex(p) for p in parts[1:])
+            alternatives.append('^' + body + '$')
+        else:
+            body = '/'.join(_glob_component_to_regex(p) for p in parts)
+            alternatives.append('(?:^|/)' + body + '$')
+    if not alternatives:
+        return None
+    return re.compile('|'.join(alternatives))
+
+
+def _usable_cpu_count() -> int:
+    """Number of CPUs this process may run on.
+
+    Honours the affinity mask (taskset, systemd CPUAffinity=) where the
+    platform exposes it; os.cpu_count() counts every CPU in the host.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def _source_size(source_stat: SourceStat) -> int:
+    """Return the size in bytes from a should_process() stat."""
+    if isinstance(source_stat, os.stat_result):
+        return source_stat.st_size
+    return source_stat[0]
+
+
 def parse_arguments():
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -127,40 +362,76 @@ class VideoConverterDaemon:
             dry_run: If True, log actions without actually converting files
             validate_only: If True, only load and validate config, don't initialize daemon
         """
-        self.running = True
+        # Set on shutdown; the main loop sleeps on it so a signal wakes it at once
+        self._shutdown = threading.Event()
         self.dry_run = dry_run
         self.conversion_times = {}  # Initialize early so load_processed_files can use it
+        self._hash_cache: Dict[str, int] = {}  # path -> hash, reset every discovery
         self._sftp_conn = None  # Initialize before validate_config may reference it
+        self._sftp_pool = None  # sftp_ops.SFTPConnectionPool for transfers, see _init_remote
+        self._watcher = None  # fs_watch.InotifyWatcher, started by run() if daemon.watch
         self.config = self.load_config(config_path)
         self.validate_config()
+        remote = self.config.get('remote', {})
+        self._remote_mode = bool(remote and remote.get('enabled', False))
 
         # If validate_only, skip the rest of initialization
         if validate_only:
             return
 
         self.setup_logging()
+        self._bind_config()
+        self.hwaccel, self.video_encoder = self._select_video_encoder()
+        cpu_count = _usable_cpu_count()
+        max_workers = self.config['daemon']['max_workers']
+        if max_workers > cpu_count:
+            self.logger.warning(
+                "max_workers (%d) exceeds CPU count (%d); concurrent encodes "
+                "will compete for cores. 1 is recommended for software encoding.",
+                max_workers, cpu_count
+            )
+        # Threads per software encode. None leaves one encode on all cores;
+        # with several workers each gets its share, since every encoder
+        # would otherwise start a thread per core and oversubscribe them.
+        self.encoder_threads = max(1, cpu_count // max_workers) if max_workers > 1 else None
         self.processed_files = self.load_processed_files()
         self.converting = set()
         self._converting_lock = threading.Lock()
         self._processed_lock = threading.Lock()
+        # Conversion worker pool, created on first use and kept for the
+        # daemon's lifetime (see _get_executor)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Caps concurrent ffmpeg runs at max_workers when the pool has
+        # more workers than that (remote mode)
+        self._encode_slots = threading.BoundedSemaphore(self.config['daemon']['max_workers'])
+        # Remote originals awaiting deletion, flushed once per batch
+        self._pending_deletes: List[str] = []
+        self._pending_deletes_lock = threading.Lock()
+        # (size, mtime) of remote files from the last listing, so
+        # should_process needs no SFTP stat per file
+        self._remote_stats: Dict[str, Tuple[int, float]] = {}
 
         # Cache resolved allowed directories to avoid repeated resolve() calls
-        self._resolved_allowed_dirs = []
-        for d in self.config.get('directories', []):
-            try:
-                resolved = Path(d).resolve(strict=True)
-                if resolved.is_dir():
-                    self._resolved_allowed_dirs.append(resolved)
-            except OSError:
-                pass
+        self._resolved_allowed_dirs = self._resolve_allowed_dirs(
+            self.config.get('directories', [])
+        )
 
         # Discovery cache to avoid redundant full traversals
         self._discovery_cache = []
         self._cache_time = 0.0
+        # Per-directory listing cache keyed on directory mtime, loaded lazily
+        self._dir_cache: Optional[Dict[str, list]] = None
+        self._dir_cache_signature: Optional[list] = None
+        # Files found so far in the current scan, shared by discovery threads
+        self._discovered = 0
+        self._discovered_lock = threading.Lock()
 
         # Security: Create work directory with restrictive permissions
-        work_dir = Path(self.config['processing']['work_dir'])
-        work_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self.work_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        # A dry run may share work_dir with the running service, so only
+        # the service clears out files left by a previous crash
+        if not self.dry_run:
+            self._sweep_work_dir()
 
         # Initialize remote SFTP connection if remote mode is enabled
         if self._is_remote_mode():
@@ -173,31 +444,102 @@ class VideoConverterDaemon:
         self.logger.info("Video Converter Daemon initialized%s",
                          " (remote mode)" if self._is_remote_mode() else "")
 
+    def _sweep_work_dir(self):
+        """Remove conversion temp files left in work_dir by a crash.
+
+        Only names the daemon itself creates (WORK_TEMP_FILE_RE) are removed.
+        """
+        try:
+            with os.scandir(self.work_dir) as entries:
+                stale = [e for e in entries
+                         if WORK_TEMP_FILE_RE.match(e.name) and e.is_file(follow_symlinks=False)]
+        except OSError as e:
+            self.logger.warning("Cannot list work directory %s: %s", self.work_dir, e)
+            return
+        for entry in stale:
+            try:
+                os.unlink(entry.path)
+            except OSError as e:
+                self.logger.warning("Cannot remove stale temp file %s: %s", entry.path, e)
+        if stale:
+            self.logger.info("Removed %d stale temp file(s) from %s", len(stale), self.work_dir)
+
     def _is_remote_mode(self) -> bool:
         """Check if remote mode is enabled in config."""
-        remote = self.config.get('remote', {})
-        return bool(remote and remote.get('enabled', False))
+        return self._remote_mode
+
+    def _bind_config(self):
+        """Bind validated config values used on per-file paths to attributes.
+
+        Runs once after validation so should_process/convert_video do not
+        walk nested config dicts for every file. Must be called again if
+        self.config is modified afterwards.
+        """
+        proc = self.config['processing']
+        # Resolved once so the per-file containment check only resolves
+        # the temp output
+        self.work_dir = Path(proc['work_dir']).resolve()
+        self.state_dir = Path(proc.get('state_dir', DEFAULT_STATE_DIR))
+        self._processed_db_path = self.state_dir / 'processed.json'
+        self._processed_journal_path = self.state_dir / 'processed.jsonl'
+        self.keep_original = bool(proc.get('keep_original', True))
+        self.min_free_bytes = int(
+            proc.get('min_free_space_gb', MIN_FREE_SPACE_GB_DEFAULT) * 1024 * 1024 * 1024
+        )
+        self.ext_set = frozenset(f".{e.lower()}" for e in proc.get('include_extensions', []))
+        self.exclude_patterns = tuple(proc.get('exclude_patterns', []))
+        self._exclude_re = compile_exclude_patterns(self.exclude_patterns)
+        conv = self.config['conversion']
+        self.stall_timeout = conv.get('stall_timeout', FFMPEG_STALL_TIMEOUT_DEFAULT)
+        self.vaapi_device = conv.get('vaapi_device', DEFAULT_VAAPI_DEVICE)
+
+        if self._remote_mode:
+            remote = self.config['remote']
+            self.remote_dirs = list(remote['directories'])
+            self.transfer_timeout = remote.get('transfer_timeout', 3600)
 
     def _init_remote(self):
         """Initialize remote SFTP connection (lazy import of paramiko)."""
         try:
-            from sftp_ops import SFTPConnection
+            from sftp_ops import SFTPConnection, SFTPConnectionPool
         except ImportError:
             raise ImportError(
                 "paramiko is required for remote mode. Install it with: pip install paramiko>=3.0.0"
             )
 
         remote = self.config['remote']
-        self._sftp_conn = SFTPConnection(
+        conn_kwargs = dict(
             host=remote['host'],
             user=remote['user'],
             port=remote.get('port', 22),
             key_file=remote.get('key_file'),
             connect_timeout=remote.get('connect_timeout', 30),
+            max_requests=remote.get('sftp_max_requests', SFTP_MAX_REQUESTS_DEFAULT),
             custom_logger=self.logger,
         )
+        self._sftp_conn = SFTPConnection(**conn_kwargs)
         self._sftp_conn.connect()
 
+        # Downloads and uploads check out a connection of their own, so
+        # concurrent transfers each have a TCP stream and a channel whose
+        # timeout no other thread touches. Discovery, stats and deletes
+        # stay on the main connection.
+        self._sftp_pool = SFTPConnectionPool(
+            self._max_connections(),
+            channel_timeout=self.transfer_timeout,
+            **conn_kwargs
+        )
+
+    def _max_connections(self) -> int:
+        """remote.max_connections, defaulting to one connection per worker."""
+        return self.config['remote'].get(
+            'max_connections', self.config.get('daemon', {}).get('max_workers', 1)
+        )
+
+    def _transfer_connection(self):
+        """Context manager checking out an SFTP connection for one transfer."""
+        return self._sftp_pool.acquire()
+
     def load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file"""
         # Security: Resolve to absolute path and verify it is a regular file
@@ -205,7 +547,7 @@ class VideoConverterDaemon:
         if not config_resolved.is_file():
             raise FileNotFoundError(f"Config file not found: {config_resolved}")
         with open(config_resolved, 'r') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=YamlSafeLoader)
 
     def validate_config(self):
         """Validate all configuration values against allowlists.
@@ -217,32 +559,44 @@ class VideoConverterDaemon:
         proc = self.config.get('processing', {})
         daemon = self.config.get('daemon', {})
 
-        # Validate codec
-        codec = conv.get('codec', '')
-        if codec not in ALLOWED_CODECS:
-            raise ConfigValidationError(
-                f"Invalid codec '{codec}'. Allowed: {sorted(ALLOWED_CODECS)}"
-            )
+        # Security: Values passed to ffmpeg or used for logging must be in
+        # their allowlist
+        for section, key, default, allowed in CONFIG_ALLOWLIST_FIELDS:
+            value = self.config.get(section, {}).get(key, default)
+            if value not in allowed:
+                raise ConfigValidationError(
+                    f"Invalid {key} '{value}'. Allowed: {sorted(allowed)}"
+                )
 
-        # Validate audio codec
-        audio_codec = conv.get('audio_codec', '')
-        if audio_codec not in ALLOWED_AUDIO_CODECS:
+        # Validate bounded numeric settings. max_workers are threads that
+        # mostly wait on ffmpeg, which already spreads one encode across every
+        # core, so extra workers only help when there are spare cores (or a
+        # GPU encoder); the daemon warns at startup if it exceeds os.cpu_count().
+        for section, key, default, types, minimum, maximum, hint in CONFIG_RANGE_FIELDS:
+            value = self.config.get(section, {}).get(key, default)
+            if (not isinstance(value, types) or value < minimum
+                    or (maximum is not None and value > maximum)):
+                raise ConfigValidationError(f"Invalid {key} '{value}'. {hint}")
+
+        # Validate the codec can be encoded by the hardware backend
+        codec = conv.get('codec', '')
+        hwaccel = conv.get('hwaccel', 'none')
+        if hwaccel in HW_ENCODERS and codec not in HW_ENCODERS[hwaccel]:
             raise ConfigValidationError(
-                f"Invalid audio_codec '{audio_codec}'. Allowed: {sorted(ALLOWED_AUDIO_CODECS)}"
+                f"codec '{codec}' cannot be used with hwaccel '{hwaccel}'. "
+                f"Allowed: {sorted(HW_ENCODERS[hwaccel])}"
             )
-
-        # Validate preset
-        preset = conv.get('preset', '')
-        if preset not in ALLOWED_PRESETS:
+        if hwaccel == 'auto' and codec not in HWACCEL_AUTO_CODECS:
             raise ConfigValidationError(
-                f"Invalid preset '{preset}'. Allowed: {sorted(ALLOWED_PRESETS)}"
+                f"codec '{codec}' cannot be used with hwaccel 'auto'. "
+                f"Allowed: {sorted(HWACCEL_AUTO_CODECS)}"
             )
 
-        # Validate CRF (integer 0-51)
-        crf = conv.get('crf', 23)
-        if not isinstance(crf, int) or crf < 0 or crf > 51:
+        # Validate VAAPI render node (passed to ffmpeg as -vaapi_device)
+        vaapi_device = conv.get('vaapi_device', DEFAULT_VAAPI_DEVICE)
+        if not VAAPI_DEVICE_RE.match(str(vaapi_device)):
             raise ConfigValidationError(
-                f"Invalid crf '{crf}'. Must be integer 0-51."
+                f"Invalid vaapi_device '{vaapi_device}'. Must be a render node /dev/dri/renderD120-129."
             )
 
         # Validate audio bitrate format
@@ -262,35 +616,16 @@ class VideoConverterDaemon:
                 "conversion parameters in the configuration schema instead."
             )
 
-        # Validate log level
-        log_level = daemon.get('log_level', 'INFO')
-        if log_level not in ALLOWED_LOG_LEVELS:
-            raise ConfigValidationError(
-                f"Invalid log_level '{log_level}'. Allowed: {sorted(ALLOWED_LOG_LEVELS)}"
-            )
-
-        # Validate max_workers (bounded)
-        max_workers = daemon.get('max_workers', 2)
-        if not isinstance(max_workers, int) or max_workers < 1 or max_workers > MAX_WORKERS_LIMIT:
-            raise ConfigValidationError(
-                f"Invalid max_workers '{max_workers}'. Must be 1-{MAX_WORKERS_LIMIT}."
-            )
-
-        # Validate scan_interval (at least 30 seconds to prevent busy-loop)
-        scan_interval = daemon.get('scan_interval', 300)
-        if not isinstance(scan_interval, (int, float)) or scan_interval < 30:
+        if not isinstance(conv.get('remux_when_possible', False), bool):
             raise ConfigValidationError(
-                f"Invalid scan_interval '{scan_interval}'. Must be >= 30 seconds."
+                f"Invalid remux_when_possible '{conv.get('remux_when_possible')}'. "
+                "Must be true or false."
             )
 
-        # Validate min_free_space_gb
-        min_free_space_gb = proc.get('min_free_space_gb', MIN_FREE_SPACE_GB_DEFAULT)
-        if (not isinstance(min_free_space_gb, (int, float))
-                or min_free_space_gb < MIN_FREE_SPACE_GB_MIN
-                or min_free_space_gb > MIN_FREE_SPACE_GB_MAX):
+        # Validate watch (inotify is local-only; remote mode keeps polling)
+        if not isinstance(daemon.get('watch', False), bool):
             raise ConfigValidationError(
-                f"Invalid min_free_space_gb '{min_free_space_gb}'. "
-                f"Must be {MIN_FREE_SPACE_GB_MIN}-{MIN_FREE_SPACE_GB_MAX}."
+                f"Invalid watch '{daemon.get('watch')}'. Must be true or false."
             )
 
         # Validate include_extensions against allowlist
@@ -304,32 +639,18 @@ class VideoConverterDaemon:
         # Validate directories exist and are absolute paths
         directories = self.config.get('directories', [])
         for d in directories:
-            dir_path = Path(d)
-            if not dir_path.is_absolute():
+            if not os.path.isabs(d):
                 raise ConfigValidationError(
                     f"Directory '{d}' must be an absolute path."
                 )
 
-        # Validate work_dir is an absolute path
-        work_dir = proc.get('work_dir', '')
-        if not Path(work_dir).is_absolute():
-            raise ConfigValidationError(
-                f"work_dir '{work_dir}' must be an absolute path."
-            )
-
-        # Validate state_dir is an absolute path (if specified)
-        state_dir = proc.get('state_dir', DEFAULT_STATE_DIR)
-        if not Path(state_dir).is_absolute():
-            raise ConfigValidationError(
-                f"state_dir '{state_dir}' must be an absolute path."
-            )
-
-        # Validate log_file is an absolute path
-        log_file = daemon.get('log_file', '')
-        if not Path(log_file).is_absolute():
-            raise ConfigValidationError(
-                f"log_file '{log_file}' must be an absolute path."
-            )
+        # Validate work_dir, state_dir and log_file are absolute paths
+        for section, key, default in CONFIG_ABSOLUTE_PATH_FIELDS:
+            value = self.config.get(section, {}).get(key, default)
+            if not os.path.isabs(value):
+                raise ConfigValidationError(
+                    f"{key} '{value}' must be an absolute path."
+                )
 
         # Validate remote section (if enabled)
         remote = self.config.get('remote', {})
@@ -393,6 +714,24 @@ class VideoConverterDaemon:
                     f"remote.transfer_timeout '{transfer_timeout}' must be >= 60."
                 )
 
+            # sftp_max_requests: integer SFTP_MAX_REQUESTS_MIN-SFTP_MAX_REQUESTS_MAX
+            max_requests = remote.get('sftp_max_requests', SFTP_MAX_REQUESTS_DEFAULT)
+            if (not isinstance(max_requests, int) or max_requests < SFTP_MAX_REQUESTS_MIN
+                    or max_requests > SFTP_MAX_REQUESTS_MAX):
+                raise ConfigValidationError(
+                    f"remote.sftp_max_requests '{max_requests}' must be an integer "
+                    f"{SFTP_MAX_REQUESTS_MIN}-{SFTP_MAX_REQUESTS_MAX}."
+                )
+
+            # max_connections: integer 1-MAX_WORKERS_LIMIT (default max_workers)
+            max_connections = self._max_connections()
+            if (not isinstance(max_connections, int) or max_connections < 1
+                    or max_connections > MAX_WORKERS_LIMIT):
+                raise ConfigValidationError(
+                    f"remote.max_connections '{max_connections}' must be an integer "
+                    f"1-{MAX_WORKERS_LIMIT}."
+                )
+
     def setup_logging(self):
         """Configure logging"""
         log_file = self.config['daemon']['log_file']
@@ -403,96 +742,339 @@ class VideoConverterDaemon:
 
         log_level = getattr(logging, self.config['daemon']['log_level'])
 
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
+        # Records are formatted by the caller and queued; a listener thread
+        # does the file and console writes, so conversion and discovery
+        # threads never wait on log I/O or the handlers' locks. basicConfig
+        # only configures an unconfigured root logger, so the listener is
+        # only started when it will receive records.
+        handlers = []
+        if not logging.getLogger().handlers:
+            log_queue = queue.SimpleQueue()
+            listener = QueueListener(
+                log_queue,
                 RotatingFileHandler(
                     log_file, maxBytes=50*1024*1024, backupCount=5
                 ),
                 logging.StreamHandler()
-            ]
+            )
+            listener.start()
+            # Runs before interpreter shutdown, flushing queued records
+            atexit.register(listener.stop)
+            handlers.append(QueueHandler(log_queue))
+
+        # The format uses no thread or process fields, so skip looking them
+        # up for every record
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+
+        logging.basicConfig(
+            level=log_level,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            handlers=handlers or None
         )
         self.logger = logging.getLogger('VideoConverter')
 
-    def load_processed_files(self) -> Set[str]:
+    def load_processed_files(self) -> Set[int]:
         """Load list of already processed files
 
-        Supports both old format (list of hashes) and new format (dict with metadata)
+        Reads the processed.json snapshot, then replays conversions appended
+        to the processed.jsonl journal since the last compaction.
         Also loads conversion timing data into self.conversion_times
         """
-        state_dir = self.config['processing'].get('state_dir', DEFAULT_STATE_DIR)
-        db_file = Path(state_dir) / 'processed.json'
+        hashes = self._load_processed_snapshot()
+        self._journal_appends = self._replay_processed_journal(hashes)
+        # SHA-256 keys from older versions are kept aside and migrated to
+        # the current key the first time their file is seen (_is_processed)
+        self._legacy_processed = {h for h in hashes if isinstance(h, bytes)}
+        return hashes - self._legacy_processed
+
+    @staticmethod
+    def _parse_processed_key(key) -> Optional[ProcessedKey]:
+        """Convert an on-disk processed key to its in-memory form.
+
+        Fingerprints (16-hex, or the 32-hex BLAKE2b form they are the prefix
+        of) become ints; legacy 64-hex SHA-256 keys become their 32 raw
+        bytes, about half the memory of the hex string. Returns None for
+        anything else.
+        """
+        # A set check avoids entering the regex engine once per key
+        if (not isinstance(key, str) or len(key) not in PROCESSED_KEY_LENGTHS
+                or not HEX_DIGITS.issuperset(key)):
+            return None
+        if len(key) == LEGACY_HASH_LEN:
+            return bytes.fromhex(key)
+        return int(key[:FINGERPRINT_HEX_LEN], 16)
+
+    @staticmethod
+    def _format_processed_key(key: ProcessedKey) -> str:
+        """Convert an in-memory processed key back to its on-disk form."""
+        if isinstance(key, int):
+            return format(key, '016x')
+        return key.hex()
+
+    @staticmethod
+    def _open_processed_snapshot(f) -> Tuple[Optional[type], Iterable]:
+        """Return the top-level type of an open processed.json and its entries.
+
+        Entries are (key, metadata) pairs for a dict and keys for a list;
+        the type is None for any other document. With the optional ijson
+        package installed, entries are streamed from the file rather than
+        loading the whole document first.
+        """
+        try:
+            import ijson
+        except ImportError:
+            data = json.load(f)
+            if isinstance(data, (dict, list)):
+                return type(data), (data.items() if isinstance(data, dict) else data)
+            return None, ()
+
+        # Sniff the first significant byte to pick the streaming parser
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == b'{':
+            return dict, ijson.kvitems(f, '', use_float=True)
+        if first == b'[':
+            return list, ijson.items(f, 'item', use_float=True)
+        return None, ()
+
+    def _load_processed_snapshot(self) -> Set[ProcessedKey]:
+        """Load the processed.json snapshot
+
+        Supports both old format (list of hashes) and new format (dict with metadata)
+        """
+        db_file = self._processed_db_path
         if db_file.exists():
-            with open(db_file, 'r') as f:
-                data = json.load(f)
+            with open(db_file, 'rb') as f:
+                kind, entries = self._open_processed_snapshot(f)
 
                 # Support both old format (list) and new format (dict)
-                if isinstance(data, dict):
+                if kind is dict:
                     # New format: {hash: {timestamp, duration_seconds}}
-                    hashes = set(data.keys())
+                    hashes = set()
                     # Validate hashes and load timing data
-                    for hash_val, metadata in data.items():
-                        if not isinstance(hash_val, str) or not re.match(r'^[a-f0-9]{64}$', hash_val):
+                    for hash_val, metadata in entries:
+                        key = self._parse_processed_key(hash_val)
+                        if key is None:
                             self.logger.warning("processed.json contains invalid hash, resetting")
                             return set()
+                        hashes.add(key)
                         # Store timing data if available
                         if isinstance(metadata, dict) and isinstance(metadata.get('timestamp'), (int, float)):
-                            self.conversion_times[hash_val] = metadata
+                            self.conversion_times[key] = metadata
                     return hashes
-                elif isinstance(data, list):
+                elif kind is list:
                     # Old format: list of hashes - will be converted to new format on save
-                    for item in data:
-                        if not isinstance(item, str) or not re.match(r'^[a-f0-9]{64}$', item):
+                    hashes = set()
+                    for item in entries:
+                        key = self._parse_processed_key(item)
+                        if key is None:
                             self.logger.warning("processed.json contains invalid hash, resetting")
                             return set()
-                    return set(data)
+                        hashes.add(key)
+                    return hashes
                 else:
                     self.logger.warning("processed.json has invalid format, resetting")
                     return set()
         return set()
 
+    def _replay_processed_journal(self, hashes: Set[ProcessedKey]) -> int:
+        """Apply processed.jsonl entries to hashes and conversion_times.
+
+        A line that does not parse (e.g. torn by a crash mid-append) is
+        skipped rather than discarding the whole journal.
+
+        Returns:
+            Number of journal lines read.
+        """
+        journal = self._processed_journal_path
+        count = 0
+        try:
+            f = open(journal, 'rb')
+        except FileNotFoundError:
+            return 0
+
+        with f:
+            for line in f:
+                count += 1
+                try:
+                    entry = json.loads(line)
+                    file_hash = entry.pop('hash')
+                except (ValueError, KeyError, AttributeError, TypeError):
+                    self.logger.warning("Skipping malformed line %d in %s", count, journal)
+                    continue
+                key = self._parse_processed_key(file_hash)
+                if key is None:
+                    self.logger.warning("Skipping invalid hash on line %d in %s", count, journal)
+                    continue
+                hashes.add(key)
+                self.conversion_times[key] = entry
+        return count
+
+    def _record_processed(self, file_hash: int, metadata: Dict):
+        """Mark a file as processed and persist it with a single journal append.
+
+        Appending one line keeps each completed conversion O(1) on disk
+        instead of rewriting processed.json; the journal is folded back
+        into processed.json every JOURNAL_COMPACT_EVERY appends and on
+        shutdown.
+        """
+        line = json.dumps({"hash": self._format_processed_key(file_hash), **metadata}, separators=(',', ':')) + '\n'
+        with self._processed_lock:
+            self.processed_files.add(file_hash)
+            self.conversion_times[file_hash] = metadata
+            fd = os.open(
+                str(self._processed_journal_path),
+                os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600
+            )
+            try:
+                os.write(fd, line.encode())
+                _fdatasync(fd)
+            finally:
+                os.close(fd)
+            self._journal_appends += 1
+            compact = self._journal_appends >= JOURNAL_COMPACT_EVERY
+
+        if compact:
+            self.save_processed_files()
+
     def save_processed_files(self):
-        """Save list of processed files with timing data atomically to prevent corruption"""
-        state_dir = self.config['processing'].get('state_dir', DEFAULT_STATE_DIR)
-        db_file = Path(state_dir) / 'processed.json'
+        """Save list of processed files with timing data atomically to prevent corruption
+
+        Writes a full processed.json snapshot and then drops the journal,
+        whose entries the snapshot now contains. Entries are written one
+        at a time rather than building the whole document in memory.
+        """
+        db_file = self._processed_db_path
         tmp_file = db_file.with_suffix('.json.tmp')
 
         with self._processed_lock:
             try:
-                # Build data structure with timing information
-                data = {}
-                for file_hash in self.processed_files:
-                    if file_hash in self.conversion_times:
-                        data[file_hash] = self.conversion_times[file_hash]
-                    else:
-                        # For legacy hashes without timing data, just store timestamp
-                        data[file_hash] = {"timestamp": int(time.time())}
-
+                now = int(time.time())
                 # Security: Write to temp file first, then atomic rename
                 fd = os.open(str(tmp_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
                 with os.fdopen(fd, 'w') as f:
-                    json.dump(data, f, indent=2)
+                    # One {hash: {timestamp, duration_seconds}} entry per line
+                    f.write('{')
+                    separator = '\n'
+                    for file_hash in itertools.chain(self.processed_files, self._legacy_processed):
+                        metadata = self.conversion_times.get(file_hash)
+                        if metadata is None:
+                            # For legacy hashes without timing data, just store timestamp
+                            metadata = {"timestamp": now}
+                        f.write(separator)
+                        f.write(json.dumps(self._format_processed_key(file_hash)))
+                        f.write(': ')
+                        f.write(json.dumps(metadata, separators=(',', ':')))
+                        separator = ',\n'
+                    f.write('\n}\n')
+                    # The journal is dropped below, so the snapshot must be
+                    # on disk before it replaces processed.json
+                    f.flush()
+                    _fdatasync(f.fileno())
                 os.replace(str(tmp_file), str(db_file))
+                self._processed_journal_path.unlink(missing_ok=True)
+                self._journal_appends = 0
             except Exception:
                 # Clean up temp file on failure
                 tmp_file.unlink(missing_ok=True)
                 raise
 
+    def _compact_processed(self):
+        """Fold the processed.jsonl journal into processed.json if it has entries."""
+        if not self._journal_appends:
+            return
+        try:
+            self.save_processed_files()
+        except Exception as e:
+            self.logger.error("Could not compact processed files journal: %s", e)
+
+    @property
+    def running(self) -> bool:
+        """True until shutdown has been requested."""
+        return not self._shutdown.is_set()
+
+    @running.setter
+    def running(self, value: bool):
+        if value:
+            self._shutdown.clear()
+        else:
+            self._shutdown.set()
+
     def handle_shutdown(self, signum, frame):
         """Handle shutdown signals gracefully"""
         self.logger.info("Received signal %d, shutting down...", signum)
         self.running = False
+        if self._watcher is not None:
+            self._watcher.wake()
         if self._sftp_conn is not None:
             try:
                 self._sftp_conn.disconnect()
             except Exception:
                 pass
+        if self._sftp_pool is not None:
+            self._sftp_pool.close()
+
+    def get_file_hash(self, file_path: str) -> int:
+        """Generate a 64-bit fingerprint of the file path
+
+        The fingerprint is the leading 8 bytes of the path's 128-bit BLAKE2b
+        digest, as an int. It is only a dedup key for processed.json and
+        temp file names, not a security boundary; keeping it an int makes
+        processed_files a compact set of ints rather than hex strings, and
+        keys written as 32-hex digests by earlier versions map onto it
+        without rehashing.
+
+        Hashes are memoized per path because should_process runs for every
+        discovered file on every scan. The memo is cleared at each discovery
+        so it never outgrows one scan's worth of files.
+        """
+        file_hash = self._hash_cache.get(file_path)
+        if file_hash is None:
+            digest = hashlib.blake2b(file_path.encode(), digest_size=16).digest()
+            file_hash = int.from_bytes(digest[:8], 'big')
+            self._hash_cache[file_path] = file_hash
+        return file_hash
+
+    def _is_processed(self, file_path: str, file_hash: int) -> bool:
+        """Check whether a file has already been converted.
+
+        While keys from older versions remain, a miss on the current hash
+        falls back to the legacy SHA-256 key; a hit there is migrated to
+        the current key so the file is found directly from then on.
+        """
+        if file_hash in self.processed_files:
+            return True
+        if not self._legacy_processed:
+            return False
+
+        legacy_hash = hashlib.sha256(file_path.encode()).digest()
+        with self._processed_lock:
+            if legacy_hash not in self._legacy_processed:
+                return False
+            self._legacy_processed.discard(legacy_hash)
+            metadata = self.conversion_times.pop(legacy_hash, None)
+        self._record_processed(file_hash, metadata or {"timestamp": int(time.time())})
+        return True
 
-    def get_file_hash(self, file_path: str) -> str:
-        """Generate unique hash for file path using SHA-256"""
-        # Security: Use SHA-256 instead of MD5 (MD5 is cryptographically broken)
-        return hashlib.sha256(file_path.encode()).hexdigest()
+    @staticmethod
+    def _resolve_allowed_dirs(directories: List[str]) -> Tuple[str, ...]:
+        """Resolve directories to string prefixes ending in a separator.
+
+        Directories that do not exist or are not directories are dropped.
+        """
+        prefixes = []
+        for d in directories:
+            try:
+                resolved = Path(d).resolve(strict=True)
+                if resolved.is_dir():
+                    prefixes.append(str(resolved).rstrip(os.sep) + os.sep)
+            except OSError:
+                pass
+        return tuple(prefixes)
 
     def _is_safe_path(self, path: Path, allowed_dirs: List[str] = None) -> bool:
         """Verify a path resolves within one of the allowed directories.
@@ -500,37 +1082,28 @@ class VideoConverterDaemon:
         This prevents symlink-based path traversal attacks where a symlink
         inside a watched directory points outside of it.
 
-        Uses cached resolved directories when available for performance.
+        Uses the directories resolved once at startup; allowed_dirs is only
+        resolved when that cache is empty. Containment is a string prefix
+        check against the resolved directories.
         """
         try:
-            resolved = path.resolve(strict=True)
+            resolved = str(path.resolve(strict=True))
         except (OSError, ValueError):
             return False
 
-        # Use cached resolved dirs if available, otherwise resolve on the fly
-        if hasattr(self, '_resolved_allowed_dirs') and self._resolved_allowed_dirs:
-            resolved_dirs = self._resolved_allowed_dirs
-        else:
-            resolved_dirs = []
-            for d in (allowed_dirs or []):
-                try:
-                    resolved_dirs.append(Path(d).resolve(strict=True))
-                except OSError:
-                    continue
+        prefixes = getattr(self, '_resolved_allowed_dirs', None)
+        if not prefixes:
+            prefixes = self._resolve_allowed_dirs(allowed_dirs or [])
 
-        for allowed_resolved in resolved_dirs:
-            try:
-                resolved.relative_to(allowed_resolved)
-                return True
-            except ValueError:
-                continue
-        return False
+        resolved_dir = resolved + os.sep
+        return any(resolved_dir.startswith(prefix) for prefix in prefixes)
 
     def discover_videos(self) -> List[Union[Path, str]]:
         """Discover video files in configured directories.
 
         Returns Path objects for local mode, string paths for remote mode.
         """
+        self._hash_cache = {}
         if self._is_remote_mode():
             return self._discover_videos_remote()
         return self._discover_videos_local()
@@ -539,16 +1112,17 @@ class VideoConverterDaemon:
         """Discover video files on the remote host via SFTP."""
         from sftp_ops import sftp_list_videos, validate_remote_path
 
-        remote = self.config['remote']
-        remote_dirs = remote['directories']
+        remote_dirs = self.remote_dirs
         extensions = self.config['processing']['include_extensions']
-        exclude_patterns = self.config['processing']['exclude_patterns']
+        exclude_patterns = list(self.exclude_patterns)
 
         try:
             self._sftp_conn.ensure_connected()
+            stats: Dict[str, Tuple[int, float]] = {}
             all_videos = sftp_list_videos(
-                self._sftp_conn, remote_dirs, extensions, exclude_patterns
+                self._sftp_conn, remote_dirs, extensions, exclude_patterns, stats
             )
+            self._remote_stats = stats
 
             # Validate all discovered paths against allowed directories
             safe_videos = []
@@ -570,212 +1144,375 @@ class VideoConverterDaemon:
     def _discover_videos_local(self) -> List[Path]:
         """Discover video files in local configured directories.
 
-        Uses a single os.walk() pass per directory instead of separate glob
-        calls per extension, reducing filesystem traversals from N*extensions
-        to N (one per directory).
+        Each directory is listed with os.scandir and its accepted video
+        names are cached together with the directory's mtime. Creating,
+        deleting or renaming an entry updates the mtime of its parent, so a
+        directory whose mtime is unchanged reuses its cached listing at the
+        cost of a single stat() instead of re-reading and re-checking every
+        entry. The cache is persisted in state_dir so restarts start warm.
         """
         directories = self.config['directories']
-        extensions = self.config['processing']['include_extensions']
-        exclude_patterns = self.config['processing']['exclude_patterns']
-
-        # Build extension set once for O(1) lookups
-        ext_set = {f".{e.lower()}" for e in extensions}
+        ext_set = self.ext_set
+        exclude_patterns = self.exclude_patterns
+
+        # Cached listings are only valid for the filters they were built with
+        signature = [DIR_CACHE_FORMAT, sorted(ext_set), list(exclude_patterns)]
+        if self._dir_cache is None:
+            self._dir_cache = self._load_dir_cache(signature)
+        elif signature != self._dir_cache_signature:
+            self._dir_cache = {}
+        self._dir_cache_signature = signature
+
+        # Roots are walked concurrently: scandir/stat release the GIL, so
+        # directories on independent disks or mounts are listed in parallel
+        # and a scan takes as long as the slowest root rather than the sum.
+        # MAX_DISCOVERED_FILES is shared: every walk stops once the total
+        # across all roots reaches it.
+        self._discovered = 0
+        if len(directories) > 1:
+            workers = min(len(directories), MAX_DISCOVERY_THREADS)
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix='discover') as executor:
+                results = list(executor.map(self._scan_dir, directories))
+        else:
+            results = [self._scan_dir(d) for d in directories]
 
+        new_cache: Dict[str, list] = {}
         all_videos = []
+        for videos, dir_cache in results:
+            new_cache.update(dir_cache)
+            all_videos.extend(videos)
+
+        if len(all_videos) > MAX_DISCOVERED_FILES:
+            self.logger.warning(
+                "Discovery cap reached (%d files), stopping scan",
+                MAX_DISCOVERED_FILES
+            )
+            del all_videos[MAX_DISCOVERED_FILES:]
 
-        for directory in directories:
-            dir_path = Path(directory)
+        if new_cache != self._dir_cache:
+            self._dir_cache = new_cache
+            self._save_dir_cache()
 
-            if not dir_path.exists():
-                self.logger.warning("Directory does not exist: %s", directory)
-                continue
+        self.logger.info("Discovered %d total video files", len(all_videos))
+        return all_videos
+
+    def _scan_dir(self, directory: str) -> Tuple[List[Path], Dict[str, list]]:
+        """Walk one configured root directory.
+
+        Runs on a discovery worker thread; results are returned rather than
+        written to shared state so roots can be scanned concurrently.
 
-            # Security: Verify the directory itself resolves safely
+        Returns:
+            Tuple of (videos found, directory cache entries for this root)
+        """
+        videos: List[Path] = []
+        dir_cache: Dict[str, list] = {}
+        dir_path = Path(directory)
+
+        if not dir_path.exists():
+            self.logger.warning("Directory does not exist: %s", directory)
+            return videos, dir_cache
+
+        # Security: Verify the directory itself resolves safely
+        try:
+            resolved_dir = dir_path.resolve(strict=True)
+            if not resolved_dir.is_dir():
+                self.logger.warning("Path is not a directory: %s", directory)
+                return videos, dir_cache
+        except OSError:
+            self.logger.warning("Cannot resolve directory: %s", directory)
+            return videos, dir_cache
+
+        self.logger.debug("Scanning %s", directory)
+
+        try:
+            self._walk_local(
+                str(resolved_dir), self.ext_set, self._exclude_re, dir_cache, videos
+            )
+        except Exception as e:
+            self.logger.error("Exception scanning %s: %s", directory, e)
+
+        return videos, dir_cache
+
+    def _walk_local(self, root: str, ext_set: Set[str], exclude_re: Optional[Pattern],
+                    new_cache: Dict[str, list], all_videos: List[Path]):
+        """Depth-first walk of one root, reusing cached listings where possible.
+
+        Listings are stored in new_cache as [mtime_ns, subdirs, videos].
+        Directories modified within DIR_CACHE_RACY_NS of the scan are not
+        cached, since a change landing in the same timestamp tick would
+        otherwise go unnoticed.
+        """
+        racy_after = time.time_ns() - DIR_CACHE_RACY_NS
+        stack = [root]
+        while stack and self._discovered < MAX_DISCOVERED_FILES:
+            dirpath = stack.pop()
             try:
-                resolved_dir = dir_path.resolve(strict=True)
-                if not resolved_dir.is_dir():
-                    self.logger.warning("Path is not a directory: %s", directory)
-                    continue
-            except OSError:
-                self.logger.warning("Cannot resolve directory: %s", directory)
+                mtime_ns = os.stat(dirpath).st_mtime_ns
+            except OSError as e:
+                self.logger.warning("Cannot stat directory %s: %s", dirpath, e)
                 continue
 
-            self.logger.debug("Scanning %s", directory)
+            cached = self._dir_cache.get(dirpath)
+            if cached is not None and cached[0] == mtime_ns:
+                _, subdirs, videos = cached
+            else:
+                try:
+                    subdirs, videos = self._scan_local_dir(dirpath, ext_set, exclude_re)
+                except OSError as e:
+                    self.logger.warning("Cannot list directory %s: %s", dirpath, e)
+                    continue
+
+            if mtime_ns < racy_after:
+                new_cache[dirpath] = [mtime_ns, subdirs, videos]
 
-            try:
-                for dirpath, _dirnames, filenames in os.walk(str(resolved_dir)):
-                    for filename in filenames:
-                        if len(all_videos) >= MAX_DISCOVERED_FILES:
-                            self.logger.warning(
-                                "Discovery cap reached (%d files), stopping scan",
-                                MAX_DISCOVERED_FILES
-                            )
-                            break
-
-                        video_file = Path(dirpath) / filename
-
-                        # Check extension match
-                        if video_file.suffix.lower() not in ext_set:
-                            continue
-
-                        # Security: Only process regular files
-                        if not video_file.is_file():
-                            continue
-
-                        # Security: Verify resolved path stays within allowed directories
-                        if not self._is_safe_path(video_file, directories):
-                            self.logger.warning(
-                                "Skipping file outside allowed directories "
-                                "(possible symlink traversal): %s", video_file
-                            )
-                            continue
-
-                        # Check exclude patterns
-                        should_exclude = False
-                        for exclude_pattern in exclude_patterns:
-                            if video_file.match(exclude_pattern):
-                                should_exclude = True
-                                break
-
-                        if not should_exclude:
-                            all_videos.append(video_file)
-
-                    if len(all_videos) >= MAX_DISCOVERED_FILES:
-                        break
+            if videos:
+                all_videos.extend(Path(dirpath, name) for name in videos)
+                # Counted per directory so threads take the lock rarely
+                with self._discovered_lock:
+                    self._discovered += len(videos)
+            stack.extend(os.path.join(dirpath, name) for name in reversed(subdirs))
 
-            except Exception as e:
-                self.logger.error("Exception scanning %s: %s", directory, e)
+    def _scan_local_dir(self, dirpath: str, ext_set: Set[str],
+                        exclude_re: Optional[Pattern]) -> Tuple[List[str], List[str]]:
+        """List one directory, returning (subdirectory names, video names).
 
-        self.logger.info("Discovered %d total video files", len(all_videos))
-        return all_videos
+        Symlinks are skipped, whether to files or directories. The walk
+        starts from a resolved root, so everything it returns is inside an
+        allowed directory without resolving each path.
 
-    def should_process(self, video_path: Union[Path, str]) -> bool:
+        Raises:
+            OSError: If the directory cannot be listed.
+        """
+        subdirs = []
+        videos = []
+
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                # d_type from getdents answers these without a stat() call.
+                # Security: Never follow symlinks (symlink traversal)
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                    continue
+
+                # Check extension match on the name before touching the inode
+                if os.path.splitext(entry.name)[1].lower() not in ext_set:
+                    continue
+
+                # Security: Only process regular files
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+
+                # Check exclude patterns
+                if exclude_re is not None and exclude_re.search(entry.path):
+                    continue
+
+                videos.append(entry.name)
+
+        return subdirs, videos
+
+    def _load_dir_cache(self, signature: list) -> Dict[str, list]:
+        """Load the persisted directory listing cache.
+
+        Returns an empty cache if the file is missing, malformed, or was
+        built with different extension/exclude settings.
+        """
+        cache_file = self.state_dir / 'discovery_cache.json'
+        try:
+            with open(cache_file, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning("Ignoring unreadable discovery cache: %s", e)
+            return {}
+
+        if not isinstance(data, dict) or data.get('signature') != signature:
+            return {}
+        dirs = data.get('dirs')
+        if not isinstance(dirs, dict):
+            return {}
+        for entry in dirs.values():
+            if (not isinstance(entry, list) or len(entry) != 3
+                    or not isinstance(entry[0], int)
+                    or not isinstance(entry[1], list)
+                    or not isinstance(entry[2], list)):
+                self.logger.warning("discovery_cache.json has invalid format, ignoring")
+                return {}
+        return dirs
+
+    def _save_dir_cache(self):
+        """Persist the directory listing cache atomically (best effort)."""
+        cache_file = self.state_dir / 'discovery_cache.json'
+        tmp_file = cache_file.with_suffix('.json.tmp')
+        data = {'signature': self._dir_cache_signature, 'dirs': self._dir_cache}
+        try:
+            fd = os.open(str(tmp_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(str(tmp_file), str(cache_file))
+        except OSError as e:
+            tmp_file.unlink(missing_ok=True)
+            self.logger.warning("Could not save discovery cache: %s", e)
+
+    def should_process(self, video_path: Union[Path, str],
+                       file_hash: Optional[int] = None) -> Optional[SourceStat]:
         """Check if file should be processed.
 
         Args:
             video_path: Path object (local mode) or string (remote mode).
+            file_hash: Precomputed get_file_hash() value, if the caller has it.
+
+        Returns:
+            The source file's stat if it should be processed (os.stat_result
+            locally, (size, mtime) remotely) so convert_video can reuse it,
+            or None if it should be skipped.
         """
         if self._is_remote_mode():
-            return self._should_process_remote(str(video_path))
-        return self._should_process_local(Path(video_path))
+            return self._should_process_remote(str(video_path), file_hash)
+        return self._should_process_local(Path(video_path), file_hash)
+
+    def _should_process_remote(self, video_path: str,
+                               file_hash: Optional[int] = None) -> Optional[Tuple[int, float]]:
+        """Check if a remote file should be processed.
 
-    def _should_process_remote(self, video_path: str) -> bool:
-        """Check if a remote file should be processed."""
+        Checks run cheapest first: in-memory checks before SFTP round trips.
+        """
         from sftp_ops import sftp_exists, sftp_stat, SFTPOperationError
 
-        file_hash = self.get_file_hash(video_path)
+        # Skip if already .m4v
+        base, ext = posixpath.splitext(video_path)
+        if ext.lower() == '.m4v':
+            return None
+
+        if file_hash is None:
+            file_hash = self.get_file_hash(video_path)
 
         # Skip if already processed
-        if file_hash in self.processed_files:
-            return False
+        if self._is_processed(video_path, file_hash):
+            return None
 
         # Skip if currently converting
         with self._converting_lock:
             if file_hash in self.converting:
-                return False
-
-        # Skip if already .m4v
-        _, ext = posixpath.splitext(video_path)
-        if ext.lower() == '.m4v':
-            return False
+                return None
 
         # Skip if output already exists on remote
-        output_path = posixpath.splitext(video_path)[0] + '.m4v'
+        output_path = base + '.m4v'
         try:
             if output_path != video_path and sftp_exists(self._sftp_conn, output_path):
                 self.logger.debug("Remote output already exists: %s", output_path)
-                return False
+                return None
         except Exception as e:
             self.logger.warning("Error checking remote output %s: %s", output_path, e)
 
-        # Check remote file size
-        try:
-            size, _ = sftp_stat(self._sftp_conn, video_path)
-            if size > MAX_FILE_SIZE_BYTES:
-                self.logger.warning(
-                    "Skipping remote file exceeding size limit (%d bytes): %s",
-                    size, video_path
-                )
-                return False
-            if size == 0:
-                self.logger.warning("Skipping empty remote file: %s", video_path)
-                return False
-        except SFTPOperationError as e:
-            self.logger.warning("Cannot stat remote file %s: %s", video_path, e)
-            return False
+        # Check remote file size, from the discovery listing when available
+        listed = self._remote_stats.get(video_path)
+        if listed is not None:
+            size, mtime = listed
+        else:
+            try:
+                size, mtime = sftp_stat(self._sftp_conn, video_path)
+            except SFTPOperationError as e:
+                self.logger.warning("Cannot stat remote file %s: %s", video_path, e)
+                return None
+        if size > MAX_FILE_SIZE_BYTES:
+            self.logger.warning(
+                "Skipping remote file exceeding size limit (%d bytes): %s",
+                size, video_path
+            )
+            return None
+        if size == 0:
+            self.logger.warning("Skipping empty remote file: %s", video_path)
+            return None
 
-        return True
+        return size, mtime
+
+    def _should_process_local(self, video_path: Path,
+                              file_hash: Optional[int] = None) -> Optional[os.stat_result]:
+        """Check if a local file should be processed.
+
+        Checks run cheapest first: name and in-memory checks before stat().
+        """
+        # Skip if already .m4v
+        if video_path.suffix.lower() == '.m4v':
+            return None
 
-    def _should_process_local(self, video_path: Path) -> bool:
-        """Check if a local file should be processed."""
-        file_hash = self.get_file_hash(str(video_path))
+        if file_hash is None:
+            file_hash = self.get_file_hash(str(video_path))
 
         # Skip if already processed
-        if file_hash in self.processed_files:
-            return False
+        if self._is_processed(str(video_path), file_hash):
+            return None
 
         # Skip if currently converting (thread-safe check)
         with self._converting_lock:
             if file_hash in self.converting:
-                return False
+                return None
 
         # Skip if output already exists
         output_path = video_path.with_suffix('.m4v')
         if output_path.exists() and output_path != video_path:
             self.logger.debug("Output already exists: %s", output_path)
-            return False
-
-        # Skip if already .m4v
-        if video_path.suffix.lower() == '.m4v':
-            return False
+            return None
 
         # Security: Skip files that are too large (resource exhaustion prevention)
         try:
-            file_size = video_path.stat().st_size
+            st = video_path.stat()
+            file_size = st.st_size
             if file_size > MAX_FILE_SIZE_BYTES:
                 self.logger.warning(
                     "Skipping file exceeding size limit (%d bytes): %s",
                     file_size, video_path
                 )
-                return False
+                return None
             if file_size == 0:
                 self.logger.warning("Skipping empty file: %s", video_path)
-                return False
+                return None
         except OSError as e:
             self.logger.warning("Cannot stat file %s: %s", video_path, e)
-            return False
+            return None
 
-        return True
+        return st
 
-    def convert_video(self, video_path: Union[Path, str]) -> bool:
+    def convert_video(self, video_path: Union[Path, str],
+                      file_hash: Optional[int] = None,
+                      source_stat: Optional[SourceStat] = None) -> bool:
         """Convert a single video file.
 
         Args:
             video_path: Path object (local mode) or string (remote mode).
+            file_hash: Precomputed get_file_hash() value, if the caller has it.
+            source_stat: Stat returned by should_process(), reused for
+                timestamp preservation instead of stat'ing the source again.
 
         Returns:
             True if conversion successful, False otherwise.
         """
         if self._is_remote_mode():
-            return self._convert_video_remote(str(video_path))
-        return self._convert_video_local(Path(video_path))
+            return self._convert_video_remote(str(video_path), file_hash, source_stat)
+        return self._convert_video_local(Path(video_path), file_hash, source_stat)
 
-    def _convert_video_remote(self, video_path: str) -> bool:
+    def _convert_video_remote(self, video_path: str,
+                              file_hash: Optional[int] = None,
+                              source_stat: Optional[Tuple[int, float]] = None) -> bool:
         """Convert a remote video: download, convert locally, upload result."""
         from sftp_ops import (
-            sftp_download, sftp_upload, sftp_delete, sftp_stat,
+            sftp_download, sftp_upload, sftp_stat,
             sftp_utime, validate_remote_path, SFTPOperationError,
         )
 
-        file_hash = self.get_file_hash(video_path)
-        work_dir = Path(self.config['processing']['work_dir'])
-        remote = self.config['remote']
-        transfer_timeout = remote.get('transfer_timeout', 3600)
+        if file_hash is None:
+            file_hash = self.get_file_hash(video_path)
+        work_dir = self.work_dir
         start_time = time.time()
 
         _, remote_ext = posixpath.splitext(video_path)
-        local_input = work_dir / f"{file_hash}_input{remote_ext}"
-        local_output = work_dir / f"{file_hash}_output.m4v"
+        local_input = work_dir / f"{file_hash:016x}_input{remote_ext}"
+        local_output = work_dir / f"{file_hash:016x}_output.m4v"
         remote_output = posixpath.splitext(video_path)[0] + '.m4v'
 
         try:
@@ -788,25 +1525,23 @@ class VideoConverterDaemon:
             if self.dry_run:
                 self.logger.info("[DRY-RUN] Would download: %s", video_path)
                 self.logger.info("[DRY-RUN] Would convert and upload to: %s", remote_output)
-                with self._processed_lock:
-                    self.processed_files.add(file_hash)
-                    self.conversion_times[file_hash] = {
-                        "timestamp": int(start_time),
-                        "duration_seconds": int(time.time() - start_time),
-                        "dry_run": True
-                    }
-                self.save_processed_files()
+                self._record_processed(file_hash, {
+                    "timestamp": int(start_time),
+                    "duration_seconds": int(time.time() - start_time),
+                    "dry_run": True
+                })
                 return True
 
             # Security: Validate remote path
-            if not validate_remote_path(video_path, remote['directories']):
+            if not validate_remote_path(video_path, self.remote_dirs):
                 self.logger.error("Remote path fails validation: %s", video_path)
                 return False
 
             # Step 1: Download remote file
             self.logger.info("Downloading %s", video_path)
             try:
-                sftp_download(self._sftp_conn, video_path, str(local_input), transfer_timeout)
+                with self._transfer_connection() as conn:
+                    sftp_download(conn, video_path, str(local_input))
             except SFTPOperationError as e:
                 self.logger.error("Download failed for %s: %s", video_path, e)
                 return False
@@ -815,17 +1550,12 @@ class VideoConverterDaemon:
             self.logger.info("Converting %s", posixpath.basename(video_path))
             ffmpeg_cmd = self.build_ffmpeg_command(local_input, local_output)
 
-            result = subprocess.run(
-                ffmpeg_cmd,
-                capture_output=True,
-                text=True,
-                timeout=MAX_CONVERSION_TIMEOUT,
-            )
+            with self._encode_slots:
+                returncode, stderr_tail = self._run_ffmpeg(ffmpeg_cmd)
 
-            if result.returncode != 0:
-                stderr_truncated = result.stderr[:2000] if result.stderr else "(no stderr)"
+            if returncode != 0:
                 self.logger.error(
-                    "Conversion failed for %s: %s", video_path, stderr_truncated
+                    "Conversion failed for %s: %s", video_path, stderr_tail
                 )
                 return False
 
@@ -835,36 +1565,34 @@ class VideoConverterDaemon:
 
             # Step 3: Upload converted file
             self.logger.info("Uploading to %s", remote_output)
-            try:
-                sftp_upload(self._sftp_conn, str(local_output), remote_output, transfer_timeout)
-            except SFTPOperationError as e:
-                self.logger.error("Upload failed for %s: %s", remote_output, e)
-                return False
-
-            # Step 4: Preserve timestamps
-            try:
-                _, mtime = sftp_stat(self._sftp_conn, video_path)
-                sftp_utime(self._sftp_conn, remote_output, (mtime, mtime))
-            except Exception as e:
-                self.logger.warning("Could not preserve remote timestamps: %s", e)
+            with self._transfer_connection() as conn:
+                try:
+                    sftp_upload(conn, str(local_output), remote_output)
+                except SFTPOperationError as e:
+                    self.logger.error("Upload failed for %s: %s", remote_output, e)
+                    return False
 
-            # Step 5: Optionally delete original
-            if not self.config['processing']['keep_original']:
-                self.logger.info("Deleting remote original: %s", video_path)
+                # Step 4: Preserve timestamps
                 try:
-                    sftp_delete(self._sftp_conn, video_path)
+                    if source_stat is not None:
+                        _, mtime = source_stat
+                    else:
+                        _, mtime = sftp_stat(conn, video_path)
+                    sftp_utime(conn, remote_output, (mtime, mtime))
                 except Exception as e:
-                    self.logger.error("Failed to delete remote original: %s", e)
+                    self.logger.warning("Could not preserve remote timestamps: %s", e)
+
+            # Step 5: Optionally delete original (batched, see _flush_pending_deletes)
+            if not self.keep_original:
+                with self._pending_deletes_lock:
+                    self._pending_deletes.append(video_path)
 
             # Mark as processed
             duration = int(time.time() - start_time)
-            with self._processed_lock:
-                self.processed_files.add(file_hash)
-                self.conversion_times[file_hash] = {
-                    "timestamp": int(start_time),
-                    "duration_seconds": duration
-                }
-            self.save_processed_files()
+            self._record_processed(file_hash, {
+                "timestamp": int(start_time),
+                "duration_seconds": duration
+            })
 
             self.logger.info(
                 "Successfully converted remote file: %s (took %d seconds)",
@@ -872,9 +1600,9 @@ class VideoConverterDaemon:
             )
             return True
 
-        except subprocess.TimeoutExpired:
+        except subprocess.TimeoutExpired as e:
             self.logger.error(
-                "Conversion timeout (%ds) for %s", MAX_CONVERSION_TIMEOUT, video_path
+                "Conversion timeout (%ds) for %s", e.timeout, video_path
             )
             return False
         except Exception as e:
@@ -887,17 +1615,23 @@ class VideoConverterDaemon:
             local_input.unlink(missing_ok=True)
             local_output.unlink(missing_ok=True)
 
-    def _convert_video_local(self, video_path: Path) -> bool:
+    def _convert_video_local(self, video_path: Path,
+                             file_hash: Optional[int] = None,
+                             source_stat: Optional[os.stat_result] = None) -> bool:
         """Convert a single local video file.
 
         Args:
             video_path: Path to video file to convert.
+            file_hash: Precomputed get_file_hash() value, if the caller has it.
+            source_stat: Stat of video_path from should_process(), if available.
 
         Returns:
             True if conversion successful, False otherwise.
         """
-        file_hash = self.get_file_hash(str(video_path))
-        work_dir = Path(self.config['processing']['work_dir'])
+        if file_hash is None:
+            file_hash = self.get_file_hash(str(video_path))
+        work_dir = self.work_dir
+        temp_output = work_dir / f"{file_hash:016x}_output.m4v"
         start_time = time.time()
 
         try:
@@ -910,15 +1644,12 @@ class VideoConverterDaemon:
             if self.dry_run:
                 self.logger.info("[DRY-RUN] Would convert: %s", video_path)
                 self.logger.info("[DRY-RUN] Would output to: %s", video_path.with_suffix('.m4v'))
-                with self._processed_lock:
-                    self.processed_files.add(file_hash)
-                    # Store timing even for dry-run
-                    self.conversion_times[file_hash] = {
-                        "timestamp": int(start_time),
-                        "duration_seconds": int(time.time() - start_time),
-                        "dry_run": True
-                    }
-                self.save_processed_files()
+                # Store timing even for dry-run
+                self._record_processed(file_hash, {
+                    "timestamp": int(start_time),
+                    "duration_seconds": int(time.time() - start_time),
+                    "dry_run": True
+                })
                 return True
 
             # Security: Re-verify the file still exists and is safe before conversion
@@ -934,10 +1665,7 @@ class VideoConverterDaemon:
                 return False
 
             # Check disk space before starting conversion
-            min_free_gb = self.config['processing'].get(
-                'min_free_space_gb', MIN_FREE_SPACE_GB_DEFAULT
-            )
-            min_free_bytes = int(min_free_gb * 1024 * 1024 * 1024)
+            min_free_bytes = self.min_free_bytes
             try:
                 work_free = shutil.disk_usage(str(work_dir)).free
                 output_free = shutil.disk_usage(str(video_path.parent)).free
@@ -961,11 +1689,10 @@ class VideoConverterDaemon:
 
             # Generate output filename
             output_path = video_path.with_suffix('.m4v')
-            temp_output = work_dir / f"{file_hash}_output.m4v"
 
             # Security: Verify temp output is within work_dir
             try:
-                temp_output.resolve().relative_to(work_dir.resolve())
+                temp_output.resolve().relative_to(work_dir)
             except ValueError:
                 self.logger.error("Temp output path escapes work directory")
                 return False
@@ -974,21 +1701,12 @@ class VideoConverterDaemon:
             self.logger.info("Converting %s", video_path.name)
             ffmpeg_cmd = self.build_ffmpeg_command(video_path, temp_output)
 
-            result = subprocess.run(
-                ffmpeg_cmd,
-                capture_output=True,
-                text=True,
-                # Security: Set a timeout to prevent zombie processes
-                timeout=MAX_CONVERSION_TIMEOUT,
-            )
+            returncode, stderr_tail = self._run_ffmpeg(ffmpeg_cmd)
 
-            if result.returncode != 0:
-                # Security: Truncate stderr to prevent log flooding from malicious files
-                stderr_truncated = result.stderr[:2000] if result.stderr else "(no stderr)"
+            if returncode != 0:
                 self.logger.error(
-                    "Conversion failed for %s: %s", video_path, stderr_truncated
+                    "Conversion failed for %s: %s", video_path, stderr_tail
                 )
-                temp_output.unlink(missing_ok=True)
                 return False
 
             # Security: Verify the temp output is a regular file before moving
@@ -998,17 +1716,17 @@ class VideoConverterDaemon:
 
             # Move converted file to final location
             self.logger.info("Moving converted file to %s", output_path)
-            shutil.move(str(temp_output), str(output_path))
+            self._move_output(temp_output, output_path)
 
             # Preserve timestamps
             try:
-                stat = video_path.stat()
+                stat = source_stat if source_stat is not None else video_path.stat()
                 os.utime(output_path, (stat.st_atime, stat.st_mtime))
             except Exception as e:
                 self.logger.warning("Could not preserve timestamps: %s", e)
 
             # Delete original if configured
-            if not self.config['processing']['keep_original']:
+            if not self.keep_original:
                 self.logger.info("Deleting original: %s", video_path)
                 try:
                     video_path.unlink()
@@ -1017,20 +1735,17 @@ class VideoConverterDaemon:
 
             # Mark as processed with timing data
             duration = int(time.time() - start_time)
-            with self._processed_lock:
-                self.processed_files.add(file_hash)
-                self.conversion_times[file_hash] = {
-                    "timestamp": int(start_time),
-                    "duration_seconds": duration
-                }
-            self.save_processed_files()
+            self._record_processed(file_hash, {
+                "timestamp": int(start_time),
+                "duration_seconds": duration
+            })
 
             self.logger.info("Successfully converted: %s (took %d seconds)", video_path, duration)
             return True
 
-        except subprocess.TimeoutExpired:
+        except subprocess.TimeoutExpired as e:
             self.logger.error(
-                "Conversion timeout (%ds) for %s", MAX_CONVERSION_TIMEOUT, video_path
+                "Conversion timeout (%ds) for %s", e.timeout, video_path
             )
             return False
         except Exception as e:
@@ -1039,10 +1754,327 @@ class VideoConverterDaemon:
         finally:
             with self._converting_lock:
                 self.converting.discard(file_hash)
-            # Cleanup temp files
-            temp_output = work_dir / f"{file_hash}_output.m4v"
+            # Cleanup temp file (already moved away on success)
             temp_output.unlink(missing_ok=True)
 
+    def _move_output(self, src: Path, dst: Path):
+        """Move a finished conversion from work_dir to its final location.
+
+        A rename is tried first. When work_dir is on another filesystem
+        (EXDEV) the data is copied with copy_file_range(2), which stays in
+        the kernel and reflinks on filesystems that support it, and falls
+        back to shutil.copyfile where copy_file_range is unavailable or
+        refuses the pair of filesystems.
+
+        Raises:
+            OSError: If the file cannot be moved.
+        """
+        try:
+            os.replace(str(src), str(dst))
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+        if not self._copy_file_range(src, dst):
+            shutil.copyfile(str(src), str(dst))
+        shutil.copymode(str(src), str(dst))
+        src.unlink()
+
+    def _copy_file_range(self, src: Path, dst: Path) -> bool:
+        """Copy src to dst with os.copy_file_range.
+
+        Returns:
+            True if the copy completed, False if copy_file_range is not
+            usable here and the caller should fall back to a userspace copy.
+        """
+        if not hasattr(os, 'copy_file_range'):
+            return False
+
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            copied = 0
+            while remaining > 0:
+                try:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                except OSError as e:
+                    # Cross-device copies need Linux 5.3+, and some
+                    # filesystems do not implement it at all
+                    if copied == 0 and e.errno in (
+                        errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP
+                    ):
+                        return False
+                    raise
+                if n == 0:
+                    break
+                copied += n
+                remaining -= n
+        return True
+
+    def _run_ffmpeg(self, ffmpeg_cmd: List[str]) -> Tuple[int, str]:
+        """Run FFmpeg and return its exit code and the tail of its stderr.
+
+        stderr is drained by a reader thread into a ring buffer of two
+        FFMPEG_STDERR_CHUNK_BYTES chunks, so a multi-hour encode can neither
+        fill the pipe and stall ffmpeg nor grow the daemon's memory, and
+        nothing is decoded unless the conversion fails.
+
+        stdout carries ffmpeg's -progress report; a second reader records
+        when the output last advanced, and ffmpeg is killed if that stops
+        for stall_timeout seconds instead of waiting out the full
+        MAX_CONVERSION_TIMEOUT.
+
+        Raises:
+            subprocess.TimeoutExpired: If ffmpeg stalls or exceeds
+                MAX_CONVERSION_TIMEOUT; timeout holds the limit that was hit.
+        """
+        proc = subprocess.Popen(
+            ffmpeg_cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        start = time.monotonic()
+        ring = collections.deque(maxlen=2)
+        progress = {'advanced': start}
+        readers = [
+            threading.Thread(
+                target=self._drain_stream, args=(proc.stderr, ring),
+                name='ffmpeg-stderr', daemon=True,
+            ),
+            threading.Thread(
+                target=self._read_progress, args=(proc.stdout, progress),
+                name='ffmpeg-progress', daemon=True,
+            ),
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            while True:
+                now = time.monotonic()
+                # Security: Set a timeout to prevent zombie processes
+                elapsed = now - start
+                if elapsed >= MAX_CONVERSION_TIMEOUT:
+                    raise subprocess.TimeoutExpired(ffmpeg_cmd, MAX_CONVERSION_TIMEOUT)
+                idle = now - progress['advanced']
+                if idle >= self.stall_timeout:
+                    self.logger.error(
+                        "ffmpeg made no progress for %ds, killing it", self.stall_timeout
+                    )
+                    raise subprocess.TimeoutExpired(ffmpeg_cmd, self.stall_timeout)
+                try:
+                    returncode = proc.wait(timeout=min(
+                        FFMPEG_WATCHDOG_INTERVAL,
+                        MAX_CONVERSION_TIMEOUT - elapsed,
+                        self.stall_timeout - idle,
+                    ))
+                    break
+                except subprocess.TimeoutExpired:
+                    continue
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
+            proc.stderr.close()
+            proc.stdout.close()
+
+        if returncode == 0:
+            return 0, ''
+
+        # Security: Truncate stderr to prevent log flooding from malicious files.
+        # The end of the output is kept since that is where ffmpeg reports the error.
+        tail = b''.join(ring)[-FFMPEG_STDERR_TAIL_BYTES:].decode('utf-8', errors='replace')
+        return returncode, tail or "(no stderr)"
+
+    @staticmethod
+    def _drain_stream(stream, ring: collections.deque):
+        """Read a binary stream to EOF, keeping only the newest chunks in ring."""
+        for chunk in iter(lambda: stream.read(FFMPEG_STDERR_CHUNK_BYTES), b''):
+            ring.append(chunk)
+
+    @staticmethod
+    def _read_progress(stream, progress: Dict):
+        """Read ffmpeg -progress lines to EOF.
+
+        Sets progress['advanced'] to the monotonic time any of
+        FFMPEG_PROGRESS_KEYS last changed value.
+        """
+        for line in stream:
+            key, _, value = line.partition(b'=')
+            if key in FFMPEG_PROGRESS_KEYS:
+                value = value.strip()
+                if progress.get(key) != value:
+                    progress[key] = value
+                    progress['advanced'] = time.monotonic()
+
+    def _probe_stream_codecs(self, input_path: Path) -> Tuple[Optional[str], Optional[str]]:
+        """Return the codec names of the first video and audio streams.
+
+        Cover art (attached pictures) is not counted as video. Either name
+        is None if the stream is missing or ffprobe fails.
+        """
+        try:
+            result = subprocess.run(
+                ['ffprobe', '-v', 'error', '-print_format', 'json',
+                 '-show_entries', 'stream=codec_type,codec_name:stream_disposition=attached_pic',
+                 str(input_path)],
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=FFMPEG_PROBE_TIMEOUT,
+            )
+            streams = json.loads(result.stdout).get('streams', [])
+        except (OSError, subprocess.TimeoutExpired, ValueError, AttributeError) as e:
+            self.logger.warning("Cannot probe streams of %s: %s", input_path, e)
+            return None, None
+
+        video = audio = None
+        for stream in streams:
+            codec_type = stream.get('codec_type')
+            if (codec_type == 'video' and video is None
+                    and not stream.get('disposition', {}).get('attached_pic')):
+                video = stream.get('codec_name')
+            elif codec_type == 'audio' and audio is None:
+                audio = stream.get('codec_name')
+        return video, audio
+
+    def _probe_encoders(self) -> Set[str]:
+        """Return the names of the video encoders this ffmpeg build provides.
+
+        Returns an empty set if ffmpeg cannot be run.
+        """
+        try:
+            result = subprocess.run(
+                ['ffmpeg', '-hide_banner', '-encoders'],
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=FFMPEG_PROBE_TIMEOUT,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self.logger.warning("Cannot probe ffmpeg encoders: %s", e)
+            return set()
+
+        # Lines look like " V....D h264_nvenc    NVIDIA NVENC H.264 encoder"
+        encoders = set()
+        for line in result.stdout.splitlines():
+            fields = line.split()
+            if len(fields) >= 2 and fields[0].startswith('V'):
+                encoders.add(fields[1])
+        return encoders
+
+    def _hw_device_present(self, hwaccel: str) -> bool:
+        """Return True if the device node a hardware backend needs exists."""
+        if hwaccel == 'cuda':
+            return os.path.exists(NVIDIA_CONTROL_DEVICE)
+        return os.path.exists(self.vaapi_device)
+
+    def _test_encode(self, hwaccel: str, encoder: str) -> bool:
+        """Encode one generated frame with a hardware encoder.
+
+        Uses the same device setup as build_ffmpeg_command, so a backend
+        that passes can convert files.
+
+        Returns:
+            True if ffmpeg exited successfully.
+        """
+        if hwaccel == 'vaapi':
+            device = ['-vaapi_device', self.vaapi_device]
+            upload = ['-vf', 'format=nv12,hwupload']
+        elif hwaccel == 'qsv':
+            device = ['-init_hw_device', f'qsv=qs:hw,child_device={self.vaapi_device}',
+                      '-filter_hw_device', 'qs']
+            upload = ['-vf', 'format=nv12,hwupload=extra_hw_frames=64,format=qsv']
+        else:
+            device = upload = []
+        cmd = (
+            ['ffmpeg', '-nostdin', '-hide_banner', '-v', 'error']
+            + device
+            + ['-f', 'lavfi', '-i', 'nullsrc=s=256x256']
+            + upload
+            + ['-frames:v', '1', '-c:v', encoder, '-f', 'null', '-']
+        )
+        try:
+            result = subprocess.run(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=FFMPEG_PROBE_TIMEOUT,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self.logger.info("Test encode with %s failed: %s", encoder, e)
+            return False
+        if result.returncode != 0:
+            self.logger.info(
+                "Test encode with %s failed: %s",
+                encoder, result.stderr.strip()[-500:] or f"exit code {result.returncode}"
+            )
+            return False
+        return True
+
+    def _select_auto_encoder(self, codec: str) -> Tuple[str, str]:
+        """Pick the first hardware backend that can encode a test frame.
+
+        Distribution ffmpeg builds usually list NVENC, VAAPI and QSV
+        encoders whether or not the hardware exists, and a render node is
+        present even without a working VA driver (virtio-gpu, nouveau,
+        Intel without the media driver). Each backend therefore needs its
+        device node, its encoder and a successful one-frame test encode.
+
+        Returns:
+            Tuple of (hwaccel, encoder name); ('none', codec) if no GPU is usable.
+        """
+        candidates = [b for b in HWACCEL_AUTO_ORDER if self._hw_device_present(b)]
+        encoders = self._probe_encoders() if candidates else set()
+        for hwaccel in candidates:
+            encoder = HW_ENCODERS[hwaccel][codec]
+            if encoder in encoders and self._test_encode(hwaccel, encoder):
+                self.logger.info("Detected %s, using hardware encoder %s", hwaccel, encoder)
+                return hwaccel, encoder
+        self.logger.info("No hardware encoder detected, using %s", codec)
+        return 'none', codec
+
+    def _select_video_encoder(self) -> Tuple[str, str]:
+        """Pick the hwaccel backend and video encoder to use.
+
+        ffmpeg is only probed when hardware encoding is requested. If the
+        hardware encoder is missing, conversion falls back to the matching
+        software encoder instead of failing every file.
+
+        Returns:
+            Tuple of (hwaccel, encoder name)
+        """
+        conv = self.config['conversion']
+        codec = conv['codec']
+        hwaccel = conv.get('hwaccel', 'none')
+
+        if hwaccel == 'auto':
+            return self._select_auto_encoder(codec)
+
+        if hwaccel in HW_ENCODERS:
+            encoder = HW_ENCODERS[hwaccel][codec]
+            fallback = SOFTWARE_ENCODERS[encoder]
+            if hwaccel in ('vaapi', 'qsv') and not self._hw_device_present(hwaccel):
+                self.logger.warning(
+                    "%s device %s not found, falling back to %s",
+                    hwaccel.upper(), self.vaapi_device, fallback
+                )
+                return 'none', fallback
+            if encoder in self._probe_encoders():
+                self.logger.info("Using %s hardware encoder %s", hwaccel, encoder)
+                return hwaccel, encoder
+            self.logger.warning(
+                "Encoder %s not available in ffmpeg, falling back to %s",
+                encoder, fallback
+            )
+            return 'none', fallback
+
+        return 'none', codec
+
     def build_ffmpeg_command(self, input_path: Path, output_path: Path) -> List[str]:
         """Build FFmpeg command from validated configuration.
 
@@ -1057,46 +2089,247 @@ class VideoConverterDaemon:
         cmd = [
             'ffmpeg',
             '-nostdin',      # Security: prevent ffmpeg from reading stdin
-            '-i', str(input_path),
-            '-c:v', config['codec'],
-            '-crf', str(config['crf']),
-            '-preset', config['preset'],
-            '-c:a', config['audio_codec'],
-            '-b:a', config['audio_bitrate'],
-            '-y', str(output_path),
+            '-hide_banner',
+            '-nostats',      # No per-frame progress lines on stderr
+            '-progress', 'pipe:1',  # Machine-readable progress on stdout for the stall watchdog
         ]
 
+        # Streams already in the target codec are copied instead of re-encoded
+        copy_video = copy_audio = False
+        if config.get('remux_when_possible', False):
+            video_codec, audio_codec = self._probe_stream_codecs(input_path)
+            copy_video = video_codec is not None and \
+                video_codec == VIDEO_CODEC_STREAM_NAMES.get(config['codec'])
+            copy_audio = audio_codec is not None and \
+                audio_codec == AUDIO_CODEC_STREAM_NAMES.get(config['audio_codec'])
+            if copy_video:
+                self.logger.info("Copying %s video stream of %s", video_codec, input_path)
+
+        if copy_video:
+            cmd += ['-i', str(input_path), '-c:v', 'copy']
+            if video_codec == 'hevc':
+                # Apple players only accept HEVC in MP4 tagged hvc1
+                cmd += ['-tag:v', 'hvc1']
+        elif self.hwaccel == 'cuda':
+            # Decode on the GPU and keep frames in device memory so they go
+            # straight to NVENC without a round trip over PCIe. NVENC has
+            # no CRF; constant-quality VBR with -cq is the equivalent knob.
+            cmd += [
+                '-hwaccel', 'cuda',
+                '-hwaccel_output_format', 'cuda',
+                '-i', str(input_path),
+                '-c:v', self.video_encoder,
+                '-preset', NVENC_PRESETS[config['preset']],
+                '-tune', 'hq',
+                '-rc', 'vbr',
+                '-cq', str(config['crf']),
+                '-b:v', '0',
+            ]
+        elif self.hwaccel == 'vaapi':
+            # Decode and encode on the render node; the filter keeps
+            # hardware-decoded frames as-is and uploads any frames that
+            # had to be decoded in software. VAAPI has no CRF or presets,
+            # so crf is used as a constant QP.
+            cmd += [
+                '-vaapi_device', self.vaapi_device,
+                '-hwaccel', 'vaapi',
+                '-hwaccel_output_format', 'vaapi',
+                '-i', str(input_path),
+                '-vf', 'format=nv12|vaapi,hwupload',
+                '-c:v', self.video_encoder,
+                '-qp', str(config['crf']),
+            ]
+        elif self.hwaccel == 'qsv':
+            # Quick Sync on the render node's Intel GPU. Frames are decoded
+            # in software and uploaded, which works for any input codec;
+            # crf is used as the ICQ quality level.
+            cmd += [
+                '-init_hw_device', f'qsv=qs:hw,child_device={self.vaapi_device}',
+                '-filter_hw_device', 'qs',
+                '-i', str(input_path),
+                '-vf', 'format=nv12,hwupload=extra_hw_frames=64,format=qsv',
+                '-c:v', self.video_encoder,
+                '-preset', QSV_PRESETS[config['preset']],
+                '-global_quality', str(config['crf']),
+            ]
+        else:
+            cmd += [
+                '-i', str(input_path),
+                '-c:v', self.video_encoder,
+                '-crf', str(config['crf']),
+                '-preset', config['preset'],
+            ]
+            if self.encoder_threads is not None:
+                cmd += ['-threads', str(self.encoder_threads)]
+
+        if copy_audio:
+            cmd += ['-c:a', 'copy']
+        else:
+            cmd += ['-c:a', config['audio_codec'], '-b:a', config['audio_bitrate']]
+        cmd += ['-y', str(output_path)]
+
         return cmd
 
-    def process_batch(self, videos: List[Path]):
-        """Process a batch of videos with concurrent workers"""
+    def _flush_pending_deletes(self):
+        """Delete remote originals queued by successful remote conversions.
+
+        The files are already recorded as processed, so nothing else would
+        ever delete them: paths that could not be deleted are queued again
+        and retried by the next flush.
+        """
+        with self._pending_deletes_lock:
+            paths, self._pending_deletes = self._pending_deletes, []
+        if not paths:
+            return
+
+        from sftp_ops import sftp_delete_many
+
+        self.logger.info("Deleting %d remote original(s)", len(paths))
+        try:
+            failed = sftp_delete_many(self._sftp_conn, paths)
+        except Exception as e:
+            self.logger.error("Failed to delete remote originals: %s", e)
+            failed = paths
+        if failed:
+            self.logger.error(
+                "Failed to delete %d remote original(s); will retry", len(failed)
+            )
+            with self._pending_deletes_lock:
+                self._pending_deletes.extend(failed)
+
+    def process_batch(self, videos: List[Path]) -> int:
+        """Process a batch of videos with concurrent workers
+
+        Returns:
+            Number of videos that needed processing but were not converted.
+        """
         max_workers = self.config['daemon']['max_workers']
 
-        # Filter videos that need processing
-        to_process = [v for v in videos if self.should_process(v)]
+        # Filter videos that need processing, hashing each path once and
+        # handing the hash on to convert_video
+        to_process = []
+        for video in videos:
+            file_hash = self.get_file_hash(str(video))
+            source_stat = self.should_process(video, file_hash)
+            if source_stat is not None:
+                to_process.append((video, file_hash, source_stat))
 
         if not to_process:
             self.logger.debug("No new videos to process")
-            return
+            return 0
+
+        # Largest first: the pool hands jobs out in submission order, so the
+        # batch ends on short conversions rather than one long straggler
+        to_process.sort(key=lambda item: _source_size(item[2]), reverse=True)
 
         self.logger.info(
             "Processing %d videos with %d workers", len(to_process), max_workers
         )
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(self.convert_video, video): video
-                      for video in to_process}
+        executor = self._get_executor()
+        futures = {executor.submit(self.convert_video, video, file_hash, source_stat): video
+                   for video, file_hash, source_stat in to_process}
 
-            for future in as_completed(futures):
-                video = futures[future]
-                try:
-                    success = future.result()
-                    if success:
-                        self.logger.info("Completed: %s", video)
-                    else:
-                        self.logger.warning("Failed: %s", video)
-                except Exception as e:
-                    self.logger.error("Exception processing %s: %s", video, e)
+        failed = 0
+        for future in as_completed(futures):
+            video = futures[future]
+            try:
+                success = future.result()
+                if success:
+                    self.logger.info("Completed: %s", video)
+                else:
+                    self.logger.warning("Failed: %s", video)
+                    failed += 1
+            except Exception as e:
+                self.logger.error("Exception processing %s: %s", video, e)
+                failed += 1
+
+        self._flush_pending_deletes()
+        return failed
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the conversion worker pool, creating it on first use.
+
+        The pool is reused by every batch rather than started and torn down
+        per scan, which matters once the watcher submits small batches
+        throughout the day. run() shuts it down on exit.
+
+        In remote mode the pool has REMOTE_PIPELINE_DEPTH workers per
+        encode slot: a worker downloading or uploading holds no slot, so
+        transfers run alongside the max_workers ffmpeg processes instead
+        of leaving the CPU idle while a file is on the wire. Each transfer
+        holds a connection from the transfer pool for its duration, so
+        workers beyond max_connections wait for one rather than sharing it.
+        """
+        if self._executor is None:
+            workers = self.config['daemon']['max_workers']
+            if self._is_remote_mode():
+                workers *= REMOTE_PIPELINE_DEPTH
+            self._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix='convert'
+            )
+        return self._executor
+
+    def _start_watcher(self):
+        """Watch the configured directories with inotify.
+
+        Returns:
+            A started fs_watch.InotifyWatcher, or None if watching is not
+            possible (the daemon then falls back to polling).
+        """
+        try:
+            from fs_watch import InotifyWatcher, WatchError
+        except ImportError:
+            self.logger.warning("fs_watch module not found; polling instead of watching")
+            return None
+
+        roots = [prefix.rstrip(os.sep) or os.sep for prefix in self._resolved_allowed_dirs]
+        watcher = InotifyWatcher(roots)
+        try:
+            watcher.start()
+        except WatchError as e:
+            self.logger.warning("Cannot watch directories (%s); polling instead", e)
+            return None
+        return watcher
+
+    def _watch_until(self, deadline: float):
+        """Convert files reported by the watcher until deadline or shutdown.
+
+        Returns early if events may have been lost (queue overflow, moved
+        directory); the watcher is then rebuilt and the discovery cache
+        dropped so the caller's next scan is a full one.
+        """
+        watcher = self._watcher
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            paths = watcher.read(remaining)
+            if watcher.overflowed:
+                self.logger.warning("Filesystem events may have been lost; rescanning")
+                watcher.close()
+                self._watcher = self._start_watcher()
+                self._discovery_cache = []
+                return
+            videos = self._filter_watched_paths(paths)
+            if videos and self.running:
+                self.logger.info("Watcher reported %d new video file(s)", len(videos))
+                self.process_batch(videos)
+
+    def _filter_watched_paths(self, paths) -> List[Path]:
+        """Apply the discovery filters to paths reported by the watcher."""
+        videos = []
+        for p in sorted(paths):
+            if os.path.splitext(p)[1].lower() not in self.ext_set:
+                continue
+            path = Path(p)
+            # Security: Only regular files, never symlinks (as in discovery)
+            if path.is_symlink() or not path.is_file():
+                continue
+            if self._exclude_re is not None and self._exclude_re.search(p):
+                continue
+            videos.append(path)
+        return videos
 
     def run(self):
         """Main daemon loop"""
@@ -1115,8 +2348,19 @@ class VideoConverterDaemon:
                 self.logger.info("Scan cycle complete")
             except Exception as e:
                 self.logger.error("Error in scan cycle: %s", e, exc_info=True)
+            self._compact_processed()
+            self._release_resources()
             return
 
+        if self.config['daemon'].get('watch', False):
+            if self._is_remote_mode():
+                self.logger.warning("daemon.watch is not supported in remote mode; polling instead")
+            else:
+                self._watcher = self._start_watcher()
+
+        # Videos the last scan's batch could not convert; checked instead of
+        # re-running should_process over every cached file each cycle
+        pending = 0
         while self.running:
             try:
                 self.logger.info("Starting scan cycle...")
@@ -1126,7 +2370,7 @@ class VideoConverterDaemon:
                 cache_age = time.time() - self._cache_time
                 if (self._discovery_cache
                         and cache_age < cache_max_age
-                        and not any(self.should_process(v) for v in self._discovery_cache)):
+                        and pending == 0):
                     self.logger.debug(
                         "Using cached discovery (%d files, %.0fs old)",
                         len(self._discovery_cache), cache_age
@@ -1138,21 +2382,44 @@ class VideoConverterDaemon:
                     self._cache_time = time.time()
 
                 # Process videos
-                self.process_batch(videos)
+                pending = self.process_batch(videos)
 
                 self.logger.info(
                     "Scan cycle complete. Sleeping for %d seconds", scan_interval
                 )
 
-                # Sleep with interruption check
-                sleep_elapsed = 0
-                while sleep_elapsed < scan_interval and self.running:
-                    time.sleep(min(5, scan_interval - sleep_elapsed))
-                    sleep_elapsed += 5
+                # Sleep until the next scan, waking immediately on shutdown;
+                # with a watcher, new files are converted as they arrive and
+                # the full scan only catches up on anything it missed
+                if self._watcher is not None:
+                    self._watch_until(time.monotonic() + scan_interval)
+                else:
+                    self._shutdown.wait(scan_interval)
 
             except Exception as e:
                 self.logger.error("Error in main loop: %s", e, exc_info=True)
-                time.sleep(30)
+                # The batch may not have run to completion; rediscover
+                # rather than trust the cache next cycle
+                pending = 1
+                self._shutdown.wait(30)
+
+        self._compact_processed()
+        self._release_resources()
+
+        self.logger.info("Video Converter Daemon stopped")
+
+    def _release_resources(self):
+        """Stop the worker pool and watcher and disconnect SFTP on exit."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        # Last try for remote originals whose delete failed earlier
+        self._flush_pending_deletes()
+
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
 
         # Disconnect SFTP on exit
         if self._sftp_conn is not None:
@@ -1160,8 +2427,8 @@ class VideoConverterDaemon:
                 self._sftp_conn.disconnect()
             except Exception:
                 pass
-
-        self.logger.info("Video Converter Daemon stopped")
+        if self._sftp_pool is not None:
+            self._sftp_pool.close()
 
 def main():
     """Main entry point"""